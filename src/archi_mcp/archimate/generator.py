@@ -14,6 +14,7 @@
 
 """PlantUML ArchiMate diagram generator."""
 
+from collections import Counter
 from typing import Dict, List, Optional, Any, Union
 from pydantic import BaseModel, Field
 import json
@@ -79,6 +80,7 @@ class ArchiMateGenerator:
             translator: Optional translator for multilingual support
         """
         self.elements: Dict[str, ArchiMateElement] = {}
+        self._layer_counts: Counter = Counter()  # Elements per layer value, kept in step with add_element
         self.relationships: List[ArchiMateRelationship] = []
         self.groups: Dict[str, ArchiMateGroup] = {}
         self.json_objects: List[PlantUMLJSONObject] = []
@@ -109,6 +111,32 @@ class ArchiMateGenerator:
             )
         
         self.elements[element.id] = element
+        self._layer_counts[element.layer.value] += 1
+
+    def add_elements(self, elements: List[ArchiMateElement]) -> None:
+        """Add several ArchiMate elements to the diagram at once.
+
+        All element IDs are checked before any is added, so a duplicate
+        leaves the diagram unchanged.
+
+        Args:
+            elements: ArchiMateElements to add
+
+        Raises:
+            ArchiMateGenerationError: If an element ID already exists
+        """
+        batch: Dict[str, ArchiMateElement] = {}
+        for element in elements:
+            existing = self.elements.get(element.id) or batch.get(element.id)
+            if existing is not None:
+                raise ArchiMateGenerationError(
+                    f"Element with ID '{element.id}' already exists",
+                    details={"existing_element": str(existing), "element_id": element.id}
+                )
+            batch[element.id] = element
+
+        self.elements.update(batch)
+        self._layer_counts.update(element.layer.value for element in elements)
     
     def add_relationship(self, relationship: ArchiMateRelationship) -> None:
         """Add an ArchiMate relationship to the diagram.
@@ -119,15 +147,33 @@ class ArchiMateGenerator:
         Raises:
             ArchiMateGenerationError: If relationship validation fails
         """
-        # Validate relationship
+        self._check_relationship(relationship)
+        self.relationships.append(relationship)
+
+    def add_relationships(self, relationships: List[ArchiMateRelationship]) -> None:
+        """Add several ArchiMate relationships to the diagram at once.
+
+        All relationships are validated before any is added, so a failure
+        leaves the diagram unchanged.
+
+        Args:
+            relationships: ArchiMateRelationships to add
+
+        Raises:
+            ArchiMateGenerationError: If validation fails for any relationship
+        """
+        for relationship in relationships:
+            self._check_relationship(relationship)
+        self.relationships.extend(relationships)
+
+    def _check_relationship(self, relationship: ArchiMateRelationship) -> None:
+        """Raise if a relationship is invalid for the current elements."""
         errors = relationship.validate_relationship(self.elements)
         if errors:
             raise ArchiMateGenerationError(
                 f"Relationship validation failed: {'; '.join(errors)}",
-                details={"relationship": str(relationship), "errors": errors}
+                details={"relationship": str(relationship), "relationship_id": relationship.id, "errors": errors}
             )
-        
-        self.relationships.append(relationship)
 
     def add_json_object(self, json_obj: PlantUMLJSONObject) -> None:
         """Add a JSON object to display in the diagram.
@@ -154,6 +200,30 @@ class ArchiMateGenerator:
 
         self.groups[group.id] = group
 
+    def add_groups(self, groups: List[ArchiMateGroup]) -> None:
+        """Add several ArchiMate groups to the diagram at once.
+
+        All group IDs are checked before any is added, so a duplicate
+        leaves the diagram unchanged.
+
+        Args:
+            groups: ArchiMateGroups to add
+
+        Raises:
+            ArchiMateGenerationError: If a group ID already exists
+        """
+        batch: Dict[str, ArchiMateGroup] = {}
+        for group in groups:
+            existing = self.groups.get(group.id) or batch.get(group.id)
+            if existing is not None:
+                raise ArchiMateGenerationError(
+                    f"Group with ID '{group.id}' already exists",
+                    details={"existing_group": str(existing), "group_id": group.id}
+                )
+            batch[group.id] = group
+
+        self.groups.update(batch)
+
     def hide_elements(self, element_ids: List[str]) -> None:
         """Hide specific elements by ID.
 
@@ -634,8 +704,7 @@ class ArchiMateGenerator:
         lines.append("legend right")
         
         # Show layers present in diagram
-        layers_used = set(element.layer.value for element in self.elements.values())
-        for layer in sorted(layers_used):
+        for layer in sorted(self._layer_counts):
             translated_layer = self.translator.translate_layer(layer)
             lines.append(f"  {translated_layer}")
         
@@ -644,6 +713,7 @@ class ArchiMateGenerator:
     def clear(self) -> None:
         """Clear all elements, relationships, JSON objects, and hide/remove rules."""
         self.elements.clear()
+        self._layer_counts.clear()
         self.relationships.clear()
         self.json_objects.clear()
         self.hidden_elements.clear()
@@ -664,7 +734,7 @@ class ArchiMateGenerator:
     
     def get_layers_used(self) -> List[str]:
         """Get list of layers used in diagram."""
-        return list(set(element.layer.value for element in self.elements.values()))
+        return list(self._layer_counts)
     
     def _collect_sprites(self) -> List['PlantUMLSprite']:
         """Collect all sprites from elements in the diagram."""
@@ -16,73 +16,55 @@
 VERIFIED ✅ - PlantUML validation implemented
 """
 
-# Import main components
-from .main import mcp
+import importlib
 
-# Import models
-from .models import ElementInput, RelationshipInput, DiagramInput
+# Exported names are imported from their submodules on first access
+_LAZY_EXPORTS = {
+    "mcp": ".main",
+    "ElementInput": ".models",
+    "RelationshipInput": ".models",
+    "DiagramInput": ".models",
+    "start_http_server": ".http_server",
+    "stop_http_server": ".http_server",
+    "http_server_port": ".http_server",
+    "http_server_thread": ".http_server",
+    "http_server_running": ".http_server",
+    "find_free_port": ".http_server",
+    "translate_relationship_labels": ".language",
+    "detect_language_from_content": ".language",
+    "ELEMENT_TYPE_MAPPING": ".validators",
+    "VALID_LAYERS": ".validators",
+    "VALID_RELATIONSHIPS": ".validators",
+    "normalize_element_type": ".validators",
+    "validate_element_input": ".validators",
+    "normalize_layer": ".validators",
+    "normalize_relationship_type": ".validators",
+    "validate_relationship_name": ".validators",
+    "validate_relationship_input": ".validators",
+    "validate_plantuml_renders": ".plantuml_validator",
+    "get_env_setting": ".config",
+    "is_config_locked": ".config",
+    "get_layout_setting": ".config",
+    "create_archimate_diagram": ".request_processors.diagram_processor",
+}
 
-# Import server functions
-from .http_server import (
-    start_http_server,
-    stop_http_server,
-    http_server_port,
-    http_server_thread,
-    http_server_running,
-    find_free_port,
-)
-from .language import translate_relationship_labels, detect_language_from_content
-from .validators import (
-    ELEMENT_TYPE_MAPPING,
-    VALID_LAYERS,
-    VALID_RELATIONSHIPS,
-    normalize_element_type,
-    validate_element_input,
-    normalize_layer,
-    normalize_relationship_type,
-    validate_relationship_name,
-    validate_relationship_input,
-)
-from .plantuml_validator import validate_plantuml_renders
-from .config import get_env_setting, is_config_locked, get_layout_setting
+# Global generator and validator instances, created on first access
+_LAZY_INSTANCES = {
+    "generator": "ArchiMateGenerator",
+    "validator": "ArchiMateValidator",
+}
 
-# Import generator and validator
-from ..archimate import ArchiMateGenerator, ArchiMateValidator
+__all__ = [*_LAZY_EXPORTS, *_LAZY_INSTANCES]
 
-# Create global generator and validator instances
-generator = ArchiMateGenerator()
-validator = ArchiMateValidator()
 
-# Import diagram creation function
-from .request_processors.diagram_processor import create_archimate_diagram
-
-__all__ = [
-    "mcp",
-    "ElementInput",
-    "RelationshipInput",
-    "DiagramInput",
-    "start_http_server",
-    "stop_http_server",
-    "http_server_port",
-    "http_server_thread",
-    "http_server_running",
-    "find_free_port",
-    "translate_relationship_labels",
-    "detect_language_from_content",
-    "ELEMENT_TYPE_MAPPING",
-    "VALID_LAYERS",
-    "VALID_RELATIONSHIPS",
-    "normalize_element_type",
-    "validate_element_input",
-    "normalize_layer",
-    "normalize_relationship_type",
-    "validate_relationship_name",
-    "validate_relationship_input",
-    "validate_plantuml_renders",
-    "get_env_setting",
-    "is_config_locked",
-    "get_layout_setting",
-    "generator",
-    "validator",
-    "create_archimate_diagram"
-]
\ No newline at end of file
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is not None:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    elif name in _LAZY_INSTANCES:
+        archimate = importlib.import_module("..archimate", __name__)
+        value = getattr(archimate, _LAZY_INSTANCES[name])()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
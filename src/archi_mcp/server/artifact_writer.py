@@ -0,0 +1,74 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18T11:40:31
+# Last Updated: 2025-12-18T11:40:31
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""Background thread that persists debug artifacts off the request path."""
+
+import atexit
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ArtifactWriter:
+    """Run write jobs in order on a single daemon thread.
+
+    The thread is started on the first submitted job. Jobs are independent,
+    so a failing job is logged and the following ones still run.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, job: Callable[..., Any], *args: Any) -> None:
+        """Queue a job to be run with the given arguments."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._drain, name="artifact-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((job, args))
+
+    def flush(self) -> None:
+        """Block until every queued job has run."""
+        self._queue.join()
+
+    def _drain(self) -> None:
+        while True:
+            job, args = self._queue.get()
+            try:
+                job(*args)
+            except Exception as e:
+                logger.warning("Background artifact write failed: {}", e)
+            finally:
+                self._queue.task_done()
+
+
+_writer = ArtifactWriter()
+
+
+def write_later(job: Callable[..., Any], *args: Any) -> None:
+    """Run a write job on the shared background writer."""
+    _writer.submit(job, *args)
+
+
+def flush_artifact_writes() -> None:
+    """Wait for all pending background writes to finish."""
+    _writer.flush()
+
+
+atexit.register(flush_artifact_writes)
@@ -14,11 +14,13 @@
 """Server configuration and environment variable management."""
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any, Optional
 
 
 # Environment variable defaults - only essential layout parameters
-ENV_DEFAULTS = {
+ENV_DEFAULTS = MappingProxyType({
     # Layout Settings (these are the only configurable parameters)
     "ARCHI_MCP_DEFAULT_DIRECTION": "vertical",
     "ARCHI_MCP_DEFAULT_SHOW_LEGEND": "false",
@@ -31,15 +33,47 @@ ENV_DEFAULTS = {
     "ARCHI_MCP_DEFAULT_SHOW_RELATIONSHIP_LABELS": "true",
 
     # Logging Settings
-    "ARCHI_MCP_LOG_LEVEL": "INFO"
-}
+    "ARCHI_MCP_LOG_LEVEL": "INFO",
+    "ARCHI_MCP_RETURN_DEBUG_LOG": "false",
 
+    # Rendering Settings
+    "ARCHI_MCP_PLANTUML_PIPE": "false",
+    "ARCHI_MCP_RENDER_CACHE": "true",
+    "ARCHI_MCP_RENDER_CACHE_MAX_MB": "500"
+})
 
+
+@lru_cache(maxsize=None)
 def get_env_setting(key: str) -> str:
-    """Get environment setting with fallback to default."""
+    """Get environment setting with fallback to default.
+
+    Settings are read once per process; call clear_config_cache() after
+    changing the environment.
+    """
     return os.getenv(key, ENV_DEFAULTS.get(key, ""))
 
 
+def is_debug_logging_enabled() -> bool:
+    """Check whether DEBUG-level logging is configured for the server."""
+    return get_env_setting("ARCHI_MCP_LOG_LEVEL").strip().upper() == "DEBUG"
+
+
+def is_debug_log_returned() -> bool:
+    """Check whether successful responses include the request's debug log."""
+    return get_env_setting("ARCHI_MCP_RETURN_DEBUG_LOG").strip().lower() == "true"
+
+
+def is_plantuml_pipe_enabled() -> bool:
+    """Check whether images are rendered through persistent PlantUML pipe processes."""
+    return get_env_setting("ARCHI_MCP_PLANTUML_PIPE").strip().lower() == "true"
+
+
+def is_render_cache_enabled() -> bool:
+    """Check whether rendered images are cached between requests."""
+    return get_env_setting("ARCHI_MCP_RENDER_CACHE").strip().lower() == "true"
+
+
+@lru_cache(maxsize=None)
 def is_config_locked(key: str) -> bool:
     """Check if environment variable is locked by config (cannot be overridden by client)."""
     return os.getenv(key) is not None
@@ -52,8 +86,13 @@ def get_layout_setting(key: str, client_value=None):
     return get_env_setting(key)
 
 
+@lru_cache(maxsize=None)
 def get_layout_parameters_info():
-    """Get information about available layout parameters for documentation."""
+    """Get information about available layout parameters for documentation.
+
+    The result is shared between callers and must not be modified.
+    """
+    config_locked = {key: is_config_locked(key) for key in ENV_DEFAULTS}
     return {
         "parameters": {
             "direction": {
@@ -101,12 +140,16 @@ def get_layout_parameters_info():
                 "configurable": not is_config_locked("ARCHI_MCP_DEFAULT_SHOW_RELATIONSHIP_LABELS")
             }
         },
-        "config_locked": {
-            key: is_config_locked(key)
-            for key in ENV_DEFAULTS.keys()
-        },
+        "config_locked": config_locked,
         "client_configurable": {
-            key: not is_config_locked(key)
-            for key in ENV_DEFAULTS.keys()
+            key: not locked
+            for key, locked in config_locked.items()
         }
-    }
\ No newline at end of file
+    }
+
+
+def clear_config_cache() -> None:
+    """Forget cached settings so the next lookup re-reads the environment."""
+    get_env_setting.cache_clear()
+    is_config_locked.cache_clear()
+    get_layout_parameters_info.cache_clear()
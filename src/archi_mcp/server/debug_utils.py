@@ -11,46 +11,60 @@
 # Licensed under the MIT License.
 # Commercial licensing available upon request.
 
+
 """Debug utilities and error handling for the ArchiMate MCP server."""
 
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Dict, List
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
+from ..utils.logging import get_logger
+from .export_manager import create_export_directory
 from .models import DiagramInput
 
+logger = get_logger(__name__)
+
+
+def _write_json_file(path: Path, data: Any) -> None:
+    """Write data as indented UTF-8 JSON, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            # OPT_NON_STR_KEYS keeps parity with json.dumps, which accepts int/enum keys
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
+    else:
+        # Serialize up front so the file gets one write instead of many small chunks
+        content = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
 
 def save_debug_log(export_dir: Path, log_entries: List[Dict[str, Any]]) -> Path:
     """Save debug log to export directory."""
     debug_log_path = export_dir / "debug_log.json"
-    with open(debug_log_path, 'w', encoding='utf-8') as f:
-        json.dump(log_entries, f, indent=2, ensure_ascii=False, default=str)
+    _write_json_file(debug_log_path, log_entries)
     return debug_log_path
 
 
-def _save_failed_attempt(plantuml_code: str, diagram_input: DiagramInput, debug_log: list, error_message: str) -> None:
+def save_failed_attempt(plantuml_code: str, diagram_input: DiagramInput, debug_log: list, error_message: str) -> None:
     """Save failed attempt data for debugging."""
     try:
-        from .export_manager import create_export_directory
         export_dir = create_export_directory()
-        debug_log_path = save_debug_log(export_dir, debug_log)
+        save_debug_log(export_dir, debug_log)
 
         # Save PlantUML code
-        failed_puml_path = export_dir / "failed_diagram.puml"
-        with open(failed_puml_path, 'w', encoding='utf-8') as f:
-            f.write(plantuml_code)
+        (export_dir / "failed_diagram.puml").write_text(plantuml_code, encoding='utf-8')
 
         # Save input data
-        failed_input_path = export_dir / "failed_input.json"
-        with open(failed_input_path, 'w', encoding='utf-8') as f:
-            json.dump(diagram_input.model_dump(), f, indent=2, ensure_ascii=False)
+        (export_dir / "failed_input.json").write_text(diagram_input.model_dump_json(indent=2), encoding='utf-8')
 
-        from ..utils.logging import get_logger
-        logger = get_logger(__name__)
-        logger.warning(f"Failed attempt saved to: {export_dir}")
-        logger.warning(f"Error: {error_message}")
+        logger.warning("Failed attempt saved to: {}", export_dir)
+        logger.warning("Error: {}", error_message)
 
     except Exception as log_error:
-        from ..utils.logging import get_logger
-        logger = get_logger(__name__)
-        logger.warning(f"Could not save debug log: {log_error}")
\ No newline at end of file
+        logger.warning("Could not save debug log: {}", log_error)
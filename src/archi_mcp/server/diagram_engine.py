@@ -14,17 +14,27 @@
 """Core diagram processing engine for ArchiMate MCP server."""
 
 
+import errno
 import os
-import json
 import base64
 import zlib
 import time
 import platform
+import re
 import subprocess
+import shutil
 import tempfile
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Optional, Tuple
+
+from pydantic import ValidationError
+
+try:
+    import cairosvg
+    CAIROSVG_AVAILABLE = True
+except ImportError:
+    CAIROSVG_AVAILABLE = False
 
 from ..utils.logging import get_logger
 from ..utils.exceptions import ArchiMateError
@@ -32,16 +42,60 @@ from ..utils.json_parser import parse_json_string
 from ..i18n import ArchiMateTranslator
 from ..archimate import ArchiMateGenerator, ArchiMateValidator
 from ..archimate.generator import DiagramLayout
+from ..archimate.elements.base import (
+    ArchiMateAspect, ArchiMateElement, ArchiMateGroup, ArchiMateLayer, ComponentGroupingStyle
+)
+from ..archimate.relationships import ArchiMateRelationship
+from ..archimate.relationships.types import ArchiMateRelationshipType
 from .models import DiagramInput
 from .response_models import DiagramGenerationResponse, DiagramFiles, FileLoadResponse
-from .config import get_layout_setting
+from .config import get_layout_setting, is_debug_log_returned, is_debug_logging_enabled, is_plantuml_pipe_enabled
 from .language import detect_language_from_content, translate_relationship_labels
-from .plantuml_validator import validate_plantuml_renders, validate_png_file, find_plantuml_jar, setup_java_environment
+from .plantuml_validator import (
+    check_plantuml_structure,
+    validate_png_file,
+    validate_svg_file,
+    find_plantuml_jar,
+    setup_java_environment,
+    build_plantuml_command,
+)
+from .plantuml_pipe import get_plantuml_pipe
+from .render_cache import get_cached_render, store_render
+from .artifact_writer import write_later
+from .debug_utils import save_failed_attempt
 from .export_manager import get_exports_directory, create_export_directory, cleanup_failed_exports
 from .error_handler import build_enhanced_error_response
 
 logger = get_logger(__name__)
 
+# Element types grouped by ArchiMate aspect, used when the input omits an aspect
+_ACTIVE_STRUCTURE_TYPES = frozenset({
+    "Business_Actor", "Business_Role", "Business_Collaboration", "Business_Interface",
+    "Application_Component", "Application_Collaboration", "Application_Interface",
+    "Node", "Device", "System_Software", "Technology_Component", "Technology_Collaboration",
+    "Technology_Interface", "Path", "Communication_Network",
+    "Equipment", "Facility", "Distribution_Network",
+})
+_PASSIVE_STRUCTURE_TYPES = frozenset({
+    "Business_Object", "Business_Contract", "Business_Representation",
+    "Data_Object", "Application_DataObject", "Artifact", "Material",
+})
+
+# Enum members keyed by their string values, avoiding Enum.__call__ per element
+_LAYER_BY_VALUE = {member.value: member for member in ArchiMateLayer}
+_ASPECT_BY_VALUE = {member.value: member for member in ArchiMateAspect}
+_RELATIONSHIP_TYPE_BY_VALUE = {member.value: member for member in ArchiMateRelationshipType}
+_GROUP_STYLE_BY_VALUE = {member.value: member for member in ComponentGroupingStyle}
+
+# Characters dropped from titles used as file names; \w is Unicode-aware like str.isalnum
+_TITLE_UNSAFE_RE = re.compile(r"[^\w \-]+")
+
+
+def _now_iso() -> str:
+    """Format the current local time like datetime.isoformat() via time.strftime."""
+    now = time.time()
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now)) + f".{int(now % 1 * 1_000_000):06d}"
+
 
 def _setup_language_and_translator(diagram: DiagramInput, debug_log: list) -> Tuple[str, ArchiMateTranslator, ArchiMateGenerator]:
     """Setup language detection and translation for diagram processing."""
@@ -79,55 +133,88 @@ def _configure_layout(diagram: DiagramInput, debug_log: list) -> DiagramLayout:
         group_by_groups=group_by_groups
     )
 
-    debug_log.append(f"Layout configuration: {layout.model_dump()}")
+    # Dumping the layout model is only worth it when tracing
+    if is_debug_logging_enabled():
+        debug_log.append(f"Layout configuration: {layout.model_dump()}")
 
     return layout
 
 
-def _process_elements(generator: ArchiMateGenerator, diagram: DiagramInput, language: str, debug_log: list):
+def _process_elements(generator: ArchiMateGenerator, diagram: DiagramInput, language: str, debug_log: list) -> None:
     """Process and add elements to the generator."""
     debug_log.append(f"Processing {len(diagram.elements)} elements")
 
-    from ..archimate.elements.base import ArchiMateElement, ArchiMateLayer, ArchiMateAspect
-
+    # Per-element trace lines are only worth building when debugging
+    debug_enabled = is_debug_logging_enabled()
+
+    # Input models already validated layer/aspect values, so the loop only
+    # converts and adds; loop-invariant lookups are bound to locals once
+    active_types = _ACTIVE_STRUCTURE_TYPES
+    passive_types = _PASSIVE_STRUCTURE_TYPES
+    active_structure = ArchiMateAspect.ACTIVE_STRUCTURE
+    passive_structure = ArchiMateAspect.PASSIVE_STRUCTURE
+    behavior = ArchiMateAspect.BEHAVIOR
+    default_layer = ArchiMateLayer.BUSINESS
+    layer_by_value = _LAYER_BY_VALUE
+    aspect_by_value = _ASPECT_BY_VALUE
+
+    elements = []
     for element_data in diagram.elements:
         try:
             # Create element from input data
             # Convert layer and aspect strings to enums
-            layer = ArchiMateLayer(element_data.layer) if hasattr(ArchiMateLayer, element_data.layer) else ArchiMateLayer.BUSINESS
-            aspect = ArchiMateAspect(element_data.aspect) if element_data.aspect and hasattr(ArchiMateAspect, element_data.aspect) else ArchiMateAspect.ACTIVE_STRUCTURE
-
-            element = ArchiMateElement(
+            layer = layer_by_value.get(element_data.layer, default_layer)
+            element_type = element_data.element_type
+            if element_data.aspect:
+                aspect = aspect_by_value[element_data.aspect]
+            elif element_type in active_types:
+                aspect = active_structure
+            elif element_type in passive_types:
+                aspect = passive_structure
+            else:
+                aspect = behavior
+
+            elements.append(ArchiMateElement(
                 id=element_data.id,
                 name=element_data.name,
-                element_type=element_data.element_type,
+                element_type=element_type,
                 layer=layer,
                 aspect=aspect,
                 description=element_data.description,
                 group_id=element_data.group_id
-            )
-            generator.add_element(element)
-            debug_log.append(f"Added element: {element.id} ({element.element_type})")
+            ))
         except Exception as e:
             debug_log.append(f"Error adding element {element_data.id}: {e}")
             raise ArchiMateError(f"Failed to add element {element_data.id}: {e}")
 
+    # Check IDs and add the whole batch in one call
+    try:
+        generator.add_elements(elements)
+    except ArchiMateError as e:
+        element_id = e.details.get("element_id", "")
+        debug_log.append(f"Error adding element {element_id}: {e}")
+        raise ArchiMateError(f"Failed to add element {element_id}: {e}")
+
+    if debug_enabled:
+        debug_log.extend(f"Added element: {element.id} ({element.element_type})" for element in elements)
 
-def _process_relationships(generator: ArchiMateGenerator, diagram: DiagramInput, language: str, debug_log: list):
+
+def _process_relationships(generator: ArchiMateGenerator, diagram: DiagramInput, language: str, debug_log: list) -> None:
     """Process and add relationships to the generator."""
     debug_log.append(f"Processing {len(diagram.relationships)} relationships")
 
-    from ..archimate.relationships import ArchiMateRelationship
-    from ..archimate.relationships.types import ArchiMateRelationshipType
+    relationship_type_by_value = _RELATIONSHIP_TYPE_BY_VALUE
+    debug_enabled = is_debug_logging_enabled()
 
+    relationships = []
     for rel_data in diagram.relationships:
         try:
             # Create relationship from input data
-            relationship = ArchiMateRelationship(
+            relationships.append(ArchiMateRelationship(
                 id=rel_data.id,
                 from_element=rel_data.from_element,
                 to_element=rel_data.to_element,
-                relationship_type=ArchiMateRelationshipType(rel_data.relationship_type),
+                relationship_type=relationship_type_by_value[rel_data.relationship_type],
                 description=rel_data.description,
                 label=rel_data.label,
                 length=rel_data.length,
@@ -135,47 +222,76 @@ def _process_relationships(generator: ArchiMateGenerator, diagram: DiagramInput,
                 color=rel_data.color,
                 orientation=rel_data.orientation,
                 positioning=rel_data.positioning
-            )
-            generator.add_relationship(relationship)
-            debug_log.append(f"Added relationship: {relationship.id} ({relationship.relationship_type})")
+            ))
         except Exception as e:
             debug_log.append(f"Error adding relationship {rel_data.id}: {e}")
             raise ArchiMateError(f"Failed to add relationship {rel_data.id}: {e}")
 
+    # Validate and add the whole batch in one call
+    try:
+        generator.add_relationships(relationships)
+    except ArchiMateError as e:
+        rel_id = e.details.get("relationship_id", "")
+        debug_log.append(f"Error adding relationship {rel_id}: {e}")
+        raise ArchiMateError(f"Failed to add relationship {rel_id}: {e}")
+
+    if debug_enabled:
+        debug_log.extend(
+            f"Added relationship: {relationship.id} ({relationship.relationship_type})"
+            for relationship in relationships
+        )
 
-def _process_groups(generator: ArchiMateGenerator, diagram: DiagramInput, debug_log: list):
+
+def _process_groups(generator: ArchiMateGenerator, diagram: DiagramInput, debug_log: list) -> None:
     """Process and add groups to the generator."""
     debug_log.append(f"Processing {len(diagram.groups)} groups")
 
-    from ..archimate.elements.base import ArchiMateGroup, ComponentGroupingStyle
+    group_style_by_value = _GROUP_STYLE_BY_VALUE
+    debug_enabled = is_debug_logging_enabled()
 
+    groups = []
     for group_data in diagram.groups:
         try:
             # Create group from input data
-            group = ArchiMateGroup(
+            groups.append(ArchiMateGroup(
                 id=group_data.id,
                 name=group_data.name,
-                group_type=ComponentGroupingStyle(group_data.group_type),
+                group_type=group_style_by_value[group_data.group_type],
                 parent_group_id=group_data.parent_group_id,
                 description=group_data.description,
                 properties=group_data.properties
-            )
-            generator.add_group(group)
-            debug_log.append(f"Added group: {group.id} ({group.group_type.value})")
+            ))
         except Exception as e:
             debug_log.append(f"Error adding group {group_data.id}: {e}")
             raise ArchiMateError(f"Failed to add group {group_data.id}: {e}")
 
+    # Check IDs and add the whole batch in one call
+    try:
+        generator.add_groups(groups)
+    except ArchiMateError as e:
+        group_id = e.details.get("group_id", "")
+        debug_log.append(f"Error adding group {group_id}: {e}")
+        raise ArchiMateError(f"Failed to add group {group_id}: {e}")
+
+    if debug_enabled:
+        debug_log.extend(f"Added group: {group.id} ({group.group_type.value})" for group in groups)
+
 
 def _generate_and_validate_plantuml(generator: ArchiMateGenerator, title: str, description: str, debug_log: list) -> str:
-    """Generate PlantUML code and validate it can render."""
+    """Generate PlantUML code and check its structure.
+
+    Rendering is not tried here: _generate_images fails with PlantUML's error
+    when the PNG does not render, so a separate validation render would only
+    start Java one more time for the same answer. A PlantUML error reported
+    through the pipes makes _generate_images fall back to the one-shot run,
+    which fails on the non-zero exit status.
+    """
     # Generate PlantUML code
     debug_log.append("Generating PlantUML code")
     plantuml_code = generator.generate_plantuml(title=title, description=description)
 
-    # Validate that the PlantUML code can render
     debug_log.append("Validating PlantUML code")
-    valid, error_msg = validate_plantuml_renders(plantuml_code)
+    valid, error_msg = check_plantuml_structure(plantuml_code)
 
     if not valid:
         debug_log.append(f"PlantUML validation failed: {error_msg}")
@@ -185,62 +301,214 @@ def _generate_and_validate_plantuml(generator: ArchiMateGenerator, title: str, d
     return plantuml_code
 
 
-def _generate_images(plantuml_code: str, plantuml_jar: str, debug_log: list) -> Tuple[str, str]:
-    """Generate PNG and SVG images from PlantUML code."""
+def _generate_images(plantuml_code: str, plantuml_jar: str, debug_log: list,
+                     work_dir: Optional[Path] = None) -> Tuple[str, Optional[str]]:
+    """Generate PNG and SVG images from PlantUML code.
+
+    Intermediate files are created in ``work_dir`` (the system temp directory
+    by default); passing the export directory lets the export step rename them
+    in place instead of copying them across filesystems.
+    """
     debug_log.append("Generating images from PlantUML code")
 
-    # Setup Java environment
-    setup_java_environment()
+    cached = get_cached_render(plantuml_code, plantuml_jar)
+    if cached is not None:
+        try:
+            return _copy_cached_images(cached, debug_log, work_dir)
+        except OSError as e:
+            # The entry can be evicted by another process after the lookup
+            debug_log.append(f"Cached images could not be copied, rendering again: {e}")
+
+    # Setup Java environment; the pipes and one-shot runs use the same executable
+    java_cmd = setup_java_environment()
+
+    if is_plantuml_pipe_enabled():
+        try:
+            png_file_path, svg_file_path = _generate_images_via_pipe(
+                plantuml_code, java_cmd, plantuml_jar, debug_log, work_dir)
+            store_render(plantuml_code, plantuml_jar, png_file_path, svg_file_path)
+            return png_file_path, svg_file_path
+        except Exception as e:
+            debug_log.append(f"PlantUML pipe rendering failed, falling back to one-shot processes: {e}")
 
-    temp_file_path = _setup_output_directory(plantuml_code)
+    temp_file_path = _setup_output_directory(plantuml_code, work_dir)
 
     try:
+        if CAIROSVG_AVAILABLE:
+            rendered = _generate_images_via_svg(temp_file_path, java_cmd, plantuml_jar, debug_log)
+            if rendered is not None:
+                store_render(plantuml_code, plantuml_jar, *rendered)
+                return rendered
+
         png_process, svg_process, png_file_path, svg_file_path = _generate_single_image(
-            temp_file_path, plantuml_jar, debug_log)
+            temp_file_path, java_cmd, plantuml_jar, debug_log)
 
-        _validate_png_generation(png_process, png_file_path, debug_log)
+        try:
+            _validate_png_generation(png_process, png_file_path, debug_log)
+        except Exception:
+            # The SVG is discarded when the PNG fails; do not wait for it
+            svg_process.kill()
+            raise
 
         svg_file_path = _handle_svg_generation(svg_process, svg_file_path, debug_log)
 
+        store_render(plantuml_code, plantuml_jar, png_file_path, svg_file_path)
         return png_file_path, svg_file_path
 
     except Exception as e:
+        # Partial or rejected images must not be left in the work directory
+        _remove_render_outputs(temp_file_path)
         _handle_generation_error(e, debug_log)
     finally:
         # Clean up temporary PlantUML file
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        Path(temp_file_path).unlink(missing_ok=True)
+
+
+def _remove_render_outputs(temp_file_path: str) -> None:
+    """Delete the PNG and SVG files PlantUML writes next to a temporary source file."""
+    for suffix in ('.png', '.svg'):
+        Path(temp_file_path).with_suffix(suffix).unlink(missing_ok=True)
+
+
+def _copy_cached_images(cached: Tuple[Path, Path], debug_log: list,
+                        work_dir: Optional[Path] = None) -> Tuple[str, str]:
+    """Copy cached images to temporary files, as the export step moves them.
+
+    On failure the temporary files are removed before the error is raised.
+    """
+    cached_png, cached_svg = cached
+    debug_log.append(f"Using cached images: {cached_png.parent}")
+
+    copies = []
+    try:
+        for cached_path, suffix in ((cached_png, '.png'), (cached_svg, '.svg')):
+            with tempfile.NamedTemporaryFile(suffix=suffix, dir=work_dir, delete=False) as temp_file:
+                copies.append(temp_file.name)
+            shutil.copyfile(cached_path, copies[-1])
+    except OSError:
+        for copy_path in copies:
+            Path(copy_path).unlink(missing_ok=True)
+        raise
+
+    png_file_path, svg_file_path = copies
+    return png_file_path, svg_file_path
+
+
+def _generate_images_via_pipe(plantuml_code: str, java_cmd: str, plantuml_jar: str, debug_log: list,
+                             work_dir: Optional[Path] = None) -> Tuple[str, Optional[str]]:
+    """Render PNG and SVG through warm PlantUML pipe processes."""
+    debug_log.append("Rendering images through persistent PlantUML pipe")
+
+    # The two formats use separate processes, so render the SVG concurrently.
+    # The executor is not waited on: a failed PNG must not block on the SVG.
+    executor = ThreadPoolExecutor(max_workers=1)
+    svg_future = executor.submit(get_plantuml_pipe(java_cmd, plantuml_jar, 'svg').render, plantuml_code)
+    executor.shutdown(wait=False)
+
+    try:
+        png_bytes = get_plantuml_pipe(java_cmd, plantuml_jar, 'png').render(plantuml_code)
+
+        with tempfile.NamedTemporaryFile(suffix='.png', dir=work_dir, delete=False) as png_file:
+            png_file.write(png_bytes)
+            png_file_path = png_file.name
+
+        png_valid, png_msg = validate_png_file(Path(png_file_path))
+        if not png_valid:
+            os.remove(png_file_path)
+            raise ArchiMateError(f"Generated PNG is invalid: {png_msg}")
+    except Exception:
+        svg_future.cancel()
+        raise
+    debug_log.append(f"PNG generation successful: {png_file_path}")
 
+    svg_error = svg_future.exception()
 
-def _setup_output_directory(plantuml_code: str) -> str:
+    if svg_error is not None:
+        debug_log.append(f"SVG generation failed or not supported: {svg_error}")
+        return png_file_path, None
+    svg_bytes = svg_future.result()
+
+    with tempfile.NamedTemporaryFile(suffix='.svg', dir=work_dir, delete=False) as svg_file:
+        svg_file.write(svg_bytes)
+        svg_file_path = svg_file.name
+    debug_log.append(f"SVG generation successful: {svg_file_path}")
+
+    return png_file_path, svg_file_path
+
+
+def _generate_images_via_svg(temp_file_path: str, java_cmd: str, plantuml_jar: str,
+                            debug_log: list) -> Optional[Tuple[str, str]]:
+    """Render SVG once with PlantUML and rasterize it to PNG with cairosvg.
+
+    Returns None when the single-render path fails, so the caller can fall
+    back to running PlantUML for each format.
+    """
+    svg_file_path = temp_file_path.replace('.puml', '.svg')
+    png_file_path = temp_file_path.replace('.puml', '.png')
+    cmd_svg = build_plantuml_command(java_cmd, plantuml_jar, '-tsvg', temp_file_path)
+
+    if is_debug_logging_enabled():
+        debug_log.append(f"Running PlantUML SVG generation: {' '.join(cmd_svg)}")
+    try:
+        result = subprocess.run(cmd_svg, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=60)
+    except subprocess.TimeoutExpired:
+        debug_log.append("SVG generation timed out")
+        return None
+    if result.returncode != 0 or not validate_svg_file(Path(svg_file_path))[0]:
+        debug_log.append("SVG generation failed, rendering each format with PlantUML")
+        return None
+
+    try:
+        cairosvg.svg2png(url=svg_file_path, write_to=png_file_path)
+    except Exception as e:
+        debug_log.append(f"SVG rasterization failed, rendering each format with PlantUML: {e}")
+        return None
+
+    png_valid, png_msg = validate_png_file(Path(png_file_path))
+    if not png_valid:
+        debug_log.append(f"Rasterized PNG is invalid, rendering each format with PlantUML: {png_msg}")
+        return None
+
+    debug_log.append(f"PNG rasterized from SVG: {png_file_path}")
+    debug_log.append(f"SVG generation successful: {svg_file_path}")
+    return png_file_path, svg_file_path
+
+
+def _setup_output_directory(plantuml_code: str, work_dir: Optional[Path] = None) -> str:
     """Create temporary file for PlantUML processing."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.puml', delete=False) as temp_file:
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.puml', dir=work_dir, delete=False) as temp_file:
         temp_file.write(plantuml_code)
         return temp_file.name
 
 
-def _generate_single_image(temp_file_path: str, plantuml_jar: str, debug_log: list) -> Tuple[subprocess.Popen, subprocess.Popen, str, str]:
+def _generate_single_image(temp_file_path: str, java_cmd: str, plantuml_jar: str, debug_log: list) -> Tuple[subprocess.Popen, subprocess.Popen, str, str]:
     """Generate PNG and SVG images in parallel."""
+    # The full command lines are only worth formatting when debugging
+    debug_enabled = is_debug_logging_enabled()
+
     # Generate PNG in background
     png_file_path = temp_file_path.replace('.puml', '.png')
-    cmd_png = ['java', '-jar', plantuml_jar, '-tpng', temp_file_path]
+    cmd_png = build_plantuml_command(java_cmd, plantuml_jar, '-tpng', temp_file_path)
 
-    debug_log.append(f"Running PlantUML PNG generation: {' '.join(cmd_png)}")
+    if debug_enabled:
+        debug_log.append(f"Running PlantUML PNG generation: {' '.join(cmd_png)}")
+    # Images are written to files, so only stderr is kept for error messages
     png_process = subprocess.Popen(
         cmd_png,
-        stdout=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
         stderr=subprocess.PIPE,
         text=True
     )
 
     # Generate SVG in background (parallel with PNG)
     svg_file_path = temp_file_path.replace('.puml', '.svg')
-    cmd_svg = ['java', '-jar', plantuml_jar, '-tsvg', temp_file_path]
+    cmd_svg = build_plantuml_command(java_cmd, plantuml_jar, '-tsvg', temp_file_path)
 
-    debug_log.append(f"Running PlantUML SVG generation: {' '.join(cmd_svg)}")
+    if debug_enabled:
+        debug_log.append(f"Running PlantUML SVG generation: {' '.join(cmd_svg)}")
     svg_process = subprocess.Popen(
         cmd_svg,
-        stdout=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
         stderr=subprocess.PIPE,
         text=True
     )
@@ -251,9 +519,9 @@ def _generate_single_image(temp_file_path: str, plantuml_jar: str, debug_log: li
 def _validate_png_generation(png_process: subprocess.Popen, png_file_path: str, debug_log: list):
     """Wait for and validate PNG generation."""
     try:
-        png_process.wait(timeout=60)
+        # communicate drains stderr while waiting, so a chatty run cannot stall on a full pipe
+        _, stderr = png_process.communicate(timeout=60)
         if png_process.returncode != 0:
-            _, stderr = png_process.communicate()
             error_msg = stderr.strip() if stderr else "Unknown error"
             debug_log.append(f"PNG generation failed: {error_msg}")
             if "Unable to locate a Java Runtime" in error_msg:
@@ -275,14 +543,28 @@ def _validate_png_generation(png_process: subprocess.Popen, png_file_path: str,
 
 def _handle_svg_generation(svg_process: subprocess.Popen, svg_file_path: str, debug_log: list) -> Optional[str]:
     """Handle SVG generation completion."""
-    svg_process.wait()
-    if svg_process.returncode == 0 and os.path.exists(svg_file_path):
-        debug_log.append(f"SVG generation successful: {svg_file_path}")
-        return svg_file_path
-    else:
+    try:
+        svg_process.communicate(timeout=60)
+    except subprocess.TimeoutExpired:
+        svg_process.kill()
+        debug_log.append("SVG generation timed out")
+        Path(svg_file_path).unlink(missing_ok=True)
+        return None
+
+    if svg_process.returncode != 0:
         debug_log.append("SVG generation failed or not supported")
+        Path(svg_file_path).unlink(missing_ok=True)
         return None
 
+    svg_valid, svg_msg = validate_svg_file(Path(svg_file_path))
+    if not svg_valid:
+        debug_log.append(f"SVG generation failed or not supported: {svg_msg}")
+        Path(svg_file_path).unlink(missing_ok=True)
+        return None
+
+    debug_log.append(f"SVG generation successful: {svg_file_path}")
+    return svg_file_path
+
 
 def _handle_generation_error(error: Exception, debug_log: list):
     """Handle image generation errors."""
@@ -293,39 +575,54 @@ def _handle_generation_error(error: Exception, debug_log: list):
         raise error
 
 
+def _move_file(src: str, dst: Path) -> None:
+    """Move a file with a single rename, copying only across filesystems."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copyfile(src, dst)
+        os.remove(src)
+
+
+def _write_text_file(path: Path, content: str) -> None:
+    """Write UTF-8 text to a file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
 def _export_diagram_files(plantuml_code: str, png_file_path: str, svg_file_path: str,
                          export_dir: Path, title: str, debug_log: list) -> Tuple[str, str, str, bool]:
     """Export diagram files to the export directory."""
     debug_log.append(f"Exporting files to: {export_dir}")
 
     # Generate safe filename from title
-    safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-    safe_title = safe_title.replace(' ', '_')
-
-    # Export PlantUML code
-    puml_filename = f"{safe_title}.puml"
-    puml_path = export_dir / puml_filename
-    with open(puml_path, 'w', encoding='utf-8') as f:
-        f.write(plantuml_code)
-    debug_log.append(f"Exported PlantUML: {puml_path}")
+    safe_title = _TITLE_UNSAFE_RE.sub("", title).rstrip().replace(' ', '_')
 
-    # Export PNG
-    png_filename = f"{safe_title}.png"
-    png_export_path = export_dir / png_filename
-    os.rename(png_file_path, png_export_path)
-    debug_log.append(f"Exported PNG: {png_export_path}")
-
-    # Export SVG if available
+    puml_path = export_dir / f"{safe_title}.puml"
+    png_export_path = export_dir / f"{safe_title}.png"
     svg_export_path = None
     svg_generated = False
-    if svg_file_path and os.path.exists(svg_file_path):
-        svg_filename = f"{safe_title}.svg"
-        svg_export_path = export_dir / svg_filename
-        os.rename(svg_file_path, svg_export_path)
-        svg_generated = True
+
+    # The PlantUML source is written on a worker thread while the images are
+    # moved; a move is a full copy when the images were rendered on another filesystem
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        puml_future = executor.submit(_write_text_file, puml_path, plantuml_code)
+
+        _move_file(png_file_path, png_export_path)
+
+        if svg_file_path and os.path.exists(svg_file_path):
+            svg_export_path = export_dir / f"{safe_title}.svg"
+            _move_file(svg_file_path, svg_export_path)
+            svg_generated = True
+
+        puml_future.result()
+
+    debug_log.append(f"Exported PlantUML: {puml_path}")
+    debug_log.append(f"Exported PNG: {png_export_path}")
+    if svg_generated:
         debug_log.append(f"Exported SVG: {svg_export_path}")
-    elif svg_file_path:
-        os.remove(svg_file_path)  # Clean up if file exists but we don't use it
 
     return str(puml_path), str(png_export_path), str(svg_export_path) if svg_generated else None, svg_generated
 
@@ -345,41 +642,10 @@ def _generate_success_response(export_dir: Path, svg_generated: bool,
         message="ArchiMate diagram generated successfully",
         export_directory=str(export_dir),
         files=files,
-        debug_log=debug_log if debug_log else None
+        debug_log=debug_log if debug_log and is_debug_log_returned() else None
     )
 
 
-def save_debug_log(export_dir: Path, log_entries: List[Dict[str, Any]]) -> Path:
-    """Save debug log to export directory."""
-    debug_log_path = export_dir / "debug_log.json"
-    with open(debug_log_path, 'w', encoding='utf-8') as f:
-        json.dump(log_entries, f, indent=2, ensure_ascii=False, default=str)
-    return debug_log_path
-
-
-def _save_failed_attempt(plantuml_code: str, diagram_input: DiagramInput, debug_log: list, error_message: str) -> None:
-    """Save failed attempt data for debugging."""
-    try:
-        export_dir = create_export_directory()
-        debug_log_path = save_debug_log(export_dir, debug_log)
-
-        # Save PlantUML code
-        failed_puml_path = export_dir / "failed_diagram.puml"
-        with open(failed_puml_path, 'w', encoding='utf-8') as f:
-            f.write(plantuml_code)
-
-        # Save input data
-        failed_input_path = export_dir / "failed_input.json"
-        with open(failed_input_path, 'w', encoding='utf-8') as f:
-            json.dump(diagram_input.model_dump(), f, indent=2, ensure_ascii=False)
-
-        logger.warning(f"Failed attempt saved to: {export_dir}")
-        logger.warning(f"Error: {error_message}")
-
-    except Exception as log_error:
-        logger.warning(f"Could not save debug log: {log_error}")
-
-
 def create_archimate_diagram_impl(diagram: DiagramInput) -> DiagramGenerationResponse:
     """Generate production-ready ArchiMate diagrams with comprehensive styling and layout options.
 
@@ -445,11 +711,12 @@ def create_archimate_diagram_impl(diagram: DiagramInput) -> DiagramGenerationRes
         ArchiMateError: If diagram generation or validation fails.
     """
     debug_log = []
-    start_time = time.time()
+    # Elapsed time comes from the monotonic clock; the wall clock only labels the start
+    start_time = time.perf_counter()
 
     try:
         logger.info("Starting ArchiMate diagram creation")
-        debug_log.append(f"Started at: {datetime.now().isoformat()}")
+        debug_log.append(f"Started at: {_now_iso()}")
 
         # Prepare diagram data and configuration
         generator, title, description = _prepare_diagram_data(diagram, debug_log)
@@ -461,17 +728,18 @@ def create_archimate_diagram_impl(diagram: DiagramInput) -> DiagramGenerationRes
         return _process_generated_images(plantuml_code, diagram, title, start_time, debug_log)
 
     except Exception as e:
-        logger.error(f"Error creating ArchiMate diagram: {e}")
+        logger.error("Error creating ArchiMate diagram: {}", e)
 
-        # Save failed attempt data
-        _save_failed_attempt(plantuml_code if 'plantuml_code' in locals() else "", diagram, debug_log, str(e))
+        # Save failed attempt data in the background; the response does not depend on it
+        write_later(save_failed_attempt, plantuml_code if 'plantuml_code' in locals() else "",
+                    diagram, list(debug_log), str(e))
 
         # Build enhanced error response
         enhanced_error = build_enhanced_error_response(e, debug_log, None, locals().get('plantuml_code'))
         raise ArchiMateError(enhanced_error)
 
 
-def _prepare_diagram_data(diagram: DiagramInput, debug_log: list) -> tuple:
+def _prepare_diagram_data(diagram: DiagramInput, debug_log: list) -> Tuple[ArchiMateGenerator, str, str]:
     """Prepare diagram data and configuration."""
     # Setup language and translator
     language, translator, generator = _setup_language_and_translator(diagram, debug_log)
@@ -508,7 +776,7 @@ def _prepare_diagram_data(diagram: DiagramInput, debug_log: list) -> tuple:
     return generator, title, description
 
 
-def _generate_plantuml_code(generator, title: str, description: str, debug_log: list) -> str:
+def _generate_plantuml_code(generator: ArchiMateGenerator, title: str, description: str, debug_log: list) -> str:
     """Generate and validate PlantUML code."""
     return _generate_and_validate_plantuml(generator, title, description, debug_log)
 
@@ -520,62 +788,69 @@ def _process_generated_images(plantuml_code: str, diagram: DiagramInput, title:
     if not plantuml_jar:
         raise ArchiMateError("PlantUML JAR not found. Please install PlantUML.")
 
-    # Generate images
-    png_file_path, svg_file_path = _generate_images(plantuml_code, plantuml_jar, debug_log)
-
-    # Create export directory
+    # Render straight into the export directory so exporting is a rename
     export_dir = create_export_directory()
 
+    # Generate images
+    try:
+        png_file_path, svg_file_path = _generate_images(plantuml_code, plantuml_jar, debug_log, export_dir)
+    except Exception:
+        # Nothing was exported; only an empty directory is removed, as
+        # requests within the same second share the timestamped directory
+        try:
+            export_dir.rmdir()
+        except OSError:
+            pass
+        raise
+
     # Export files
     puml_path, png_path, svg_path, svg_generated = _export_diagram_files(
         plantuml_code, png_file_path, svg_file_path, export_dir, title, debug_log
     )
 
     # Generate success response
-    processing_time = time.time() - start_time
+    processing_time = time.perf_counter() - start_time
     debug_log.append(f"Total processing time: {processing_time:.2f} seconds")
 
     response = _generate_success_response(export_dir, svg_generated, puml_path, png_path, svg_path, debug_log)
 
-    logger.info(f"ArchiMate diagram created successfully in {processing_time:.2f} seconds")
+    logger.info("ArchiMate diagram created successfully in {:.2f} seconds", processing_time)
     return response
 
 
 def load_diagram_from_file_impl(file_path: str) -> DiagramGenerationResponse:
     """Implementation of load diagram from file."""
     try:
-        from pathlib import Path
-
         # Resolve file path
-        json_file = Path(file_path)
-        if not json_file.is_absolute():
+        cwd = os.getcwd()
+        json_file = file_path
+        if not os.path.isabs(json_file):
             # Try relative to current directory
-            json_file = Path.cwd() / file_path
+            json_file = os.path.join(cwd, file_path)
 
         # Check if file exists
-        if not json_file.exists():
-            return f"❌ Error: File not found: {json_file}\n\nSearched in: {Path.cwd()}"
+        if not os.path.exists(json_file):
+            return f"❌ Error: File not found: {json_file}\n\nSearched in: {cwd}"
 
         # Read file
-        logger.info(f"Loading diagram from file: {json_file}")
-        with open(json_file, 'r', encoding='utf-8') as f:
-            json_content = f.read()
+        logger.info("Loading diagram from file: {}", json_file)
+        with open(json_file, 'rb') as f:
+            json_bytes = f.read()
 
-        # Parse JSON first, then validate as DiagramInput
-        import json
+        # Parse and validate strict JSON in one pass
         try:
-            json_data = json.loads(json_content)
-        except json.JSONDecodeError:
+            diagram = DiagramInput.model_validate_json(json_bytes)
+        except ValidationError as e:
+            if not any(error["type"] == "json_invalid" for error in e.errors()):
+                raise
             # Try with json5 for compatibility
-            from ..utils.json_parser import parse_json_string
-            json_data = parse_json_string(json_content)
-
-        diagram = DiagramInput.model_validate(json_data)
+            json_data = parse_json_string(json_bytes.decode('utf-8'))
+            diagram = DiagramInput.model_validate(json_data)
 
-        logger.info(f"Successfully loaded diagram from file: {json_file.name}")
-        logger.info(f"  Title: {diagram.title}")
-        logger.info(f"  Elements: {len(diagram.elements)}")
-        logger.info(f"  Relationships: {len(diagram.relationships)}")
+        logger.info(
+            "Successfully loaded diagram from file: {} (title: {}, elements: {}, relationships: {})",
+            os.path.basename(json_file), diagram.title, len(diagram.elements), len(diagram.relationships)
+        )
 
         # Call the actual diagram creation function directly
         return create_archimate_diagram_impl(diagram)
@@ -583,5 +858,5 @@ def load_diagram_from_file_impl(file_path: str) -> DiagramGenerationResponse:
     except FileNotFoundError as e:
         return f"❌ Error: File not found: {file_path}\n\nDetails: {str(e)}"
     except Exception as e:
-        logger.error(f"Error loading diagram from file: {e}")
+        logger.error("Error loading diagram from file: {}", e)
         return f"❌ Error loading diagram from file:\n\n{str(e)}"
\ No newline at end of file
@@ -17,6 +17,14 @@ import os
 import re
 from typing import List, Optional, Tuple
 
+# Markers PlantUML writes when a diagram fails to render
+_ERROR_LINE_MARKER = 'Error line'
+_DIAGRAM_ERRORS_MARKER = 'Some diagram description contains errors'
+_ERROR_LINE_RE = re.compile(r'Error line (\d+)')
+
+# Only the end of a long log is shown, which is where the failure is
+_LOG_TAIL_BYTES = 64 * 1024
+
 
 def _extract_plantuml_error_details(debug_log: list) -> tuple[int, str, str, int]:
     """Extract PlantUML error details from debug log.
@@ -33,7 +41,8 @@ def _extract_plantuml_error_details(debug_log: list) -> tuple[int, str, str, int
     error_line = None
 
     for entry in debug_log:
-        if 'details' not in entry:
+        # Most entries are plain message strings; only dict entries carry details
+        if not isinstance(entry, dict) or 'details' not in entry:
             continue
 
         details = entry['details']
@@ -61,42 +70,44 @@ def _extract_command(details: dict, current_command) -> str:
 def _extract_error_output(details: dict, current_stderr: str, current_error_line: int) -> tuple[str, int]:
     """Extract error output and line number from details."""
     output = details.get('output', '')
-    has_error_line = 'Error line' in output
-    has_diagram_errors = 'Some diagram description contains errors' in output
+    marker_pos = output.find(_ERROR_LINE_MARKER)
 
-    if output and (has_error_line or has_diagram_errors):
-        stderr = details['output']
-        error_line = _extract_error_line_number(details['output']) if 'Error line' in details['output'] else current_error_line
-        return stderr, error_line
+    if marker_pos >= 0:
+        return output, _extract_error_line_number(output, marker_pos)
+    if _DIAGRAM_ERRORS_MARKER in output:
+        return output, current_error_line
 
     return current_stderr, current_error_line
 
 
-def _extract_error_line_number(output: str) -> int:
-    """Extract error line number from PlantUML output."""
-    line_match = re.search(r'Error line (\d+)', output)
+def _extract_error_line_number(output: str, pos: int = 0) -> int:
+    """Extract error line number from PlantUML output.
+
+    ``pos`` is where an ``Error line`` marker was found; the pattern is
+    matched there first and only searched for further on if that fails.
+    """
+    line_match = _ERROR_LINE_RE.match(output, pos) or _ERROR_LINE_RE.search(output, pos)
     return int(line_match.group(1)) if line_match else None
 
 
-def _add_error_context_and_debug_info(error_parts: list, plantuml_code: str, error_line: int, error_export_dir: str) -> None:
+def _add_error_context_and_debug_info(error_parts: list, lines: Optional[List[str]], error_line: int, error_export_dir: str) -> None:
     """Add problematic line context and debug information to error message.
 
     Args:
         error_parts: List to append error information to
-        plantuml_code: The PlantUML code that caused the error
+        lines: Lines of the PlantUML code that caused the error, if any
         error_line: The line number where the error occurred
         error_export_dir: Directory containing debug files
     """
-    if plantuml_code and error_line:
-        _add_problematic_line_context(error_parts, plantuml_code, error_line)
+    if lines and error_line:
+        _add_problematic_line_context(error_parts, lines, error_line)
 
     if error_export_dir:
-        _add_debug_information(error_parts, error_export_dir, plantuml_code)
+        _add_debug_information(error_parts, error_export_dir, bool(lines))
 
 
-def _add_problematic_line_context(error_parts: list, plantuml_code: str, error_line: int) -> None:
+def _add_problematic_line_context(error_parts: list, lines: List[str], error_line: int) -> None:
     """Add context around the problematic PlantUML line."""
-    lines = plantuml_code.split('\n')
     if 1 <= error_line <= len(lines):
         problematic_line = lines[error_line - 1].strip()
         error_parts.append(f"**Problematic Line {error_line}:** `{problematic_line}`")
@@ -127,11 +138,11 @@ def _build_context_lines(lines: list, error_line: int, problematic_line: str) ->
     return context_lines
 
 
-def _add_debug_information(error_parts: list, error_export_dir: str, plantuml_code: str) -> None:
+def _add_debug_information(error_parts: list, error_export_dir: str, has_plantuml_code: bool) -> None:
     """Add debug log and file information to error message."""
     _add_generation_log(error_parts, error_export_dir)
 
-    if plantuml_code:
+    if has_plantuml_code:
         _add_debug_file_list(error_parts, error_export_dir)
 
 
@@ -148,9 +159,15 @@ def _add_generation_log(error_parts: list, error_export_dir: str) -> None:
 
 
 def _add_log_file_contents(error_parts: list, log_file_path: str) -> None:
-    """Add actual log file contents."""
-    with open(log_file_path, 'r', encoding='utf-8') as f:
-        log_contents = f.read()
+    """Add actual log file contents, keeping only the tail of long logs."""
+    with open(log_file_path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        truncated = size > _LOG_TAIL_BYTES
+        f.seek(size - _LOG_TAIL_BYTES if truncated else 0)
+        # The cut may split a multi-byte character, so drop any partial one
+        log_contents = f.read().decode('utf-8', errors='ignore' if truncated else 'strict')
+    if truncated:
+        log_contents = "...(truncated)\n" + log_contents
     error_parts.append("**🔍 Debug Log:**")
     error_parts.append("```")
     error_parts.append(log_contents)
@@ -176,27 +193,26 @@ def _add_debug_file_list(error_parts: list, error_export_dir: str) -> None:
     error_parts.append(f"- `{error_export_dir}/input.json` - Original input data")
 
 
-def _add_troubleshooting_suggestions(error_parts: list, plantuml_code: str, error_line: int, plantuml_command: str) -> None:
+def _add_troubleshooting_suggestions(error_parts: list, lines: Optional[List[str]], error_line: int, plantuml_command: str) -> None:
     """Add troubleshooting suggestions to error message.
 
     Args:
         error_parts: List to append troubleshooting information to
-        plantuml_code: The PlantUML code that caused the error
+        lines: Lines of the PlantUML code that caused the error, if any
         error_line: The line number where the error occurred
         plantuml_command: The PlantUML command that was executed
     """
     error_parts.append("**🛠️ Troubleshooting:**")
 
-    if error_line and plantuml_code:
-        _add_line_specific_suggestions(error_parts, plantuml_code, error_line)
+    if error_line and lines:
+        _add_line_specific_suggestions(error_parts, lines, error_line)
 
     if plantuml_command:
         _add_command_testing_suggestion(error_parts, plantuml_command)
 
 
-def _add_line_specific_suggestions(error_parts: list, plantuml_code: str, error_line: int) -> None:
+def _add_line_specific_suggestions(error_parts: list, lines: List[str], error_line: int) -> None:
     """Add suggestions based on the specific problematic line."""
-    lines = plantuml_code.split('\n')
     if 1 <= error_line <= len(lines):
         problematic_line = lines[error_line - 1].strip()
         suggestions = _analyze_problematic_line(problematic_line)
@@ -261,11 +277,14 @@ def build_enhanced_error_response(original_error: Exception, debug_log: list, er
             error_parts.append(plantuml_stderr)
             error_parts.append("```")
 
+        # Split the code once for the context and suggestion helpers
+        lines = plantuml_code.split('\n') if plantuml_code else None
+
         # Add error context and debug info
-        _add_error_context_and_debug_info(error_parts, plantuml_code, error_line, error_export_dir)
+        _add_error_context_and_debug_info(error_parts, lines, error_line, error_export_dir)
 
         # Add troubleshooting suggestions
-        _add_troubleshooting_suggestions(error_parts, plantuml_code, error_line, plantuml_command)
+        _add_troubleshooting_suggestions(error_parts, lines, error_line, plantuml_command)
 
         return "\n\n".join(error_parts)
 
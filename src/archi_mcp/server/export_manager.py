@@ -14,13 +14,18 @@
 """Export management utilities for ArchiMate MCP Server."""
 
 import os
-from datetime import datetime
+import time
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def get_exports_directory() -> Path:
     """Get the exports directory path, creating it if needed.
 
+    The directory is created on the first call only; export directories are
+    created with ``parents=True``, so they restore it if it is removed later.
+
     Returns:
         Path to the exports directory in Documents folder
     """
@@ -36,7 +41,7 @@ def create_export_directory() -> Path:
     Returns:
         Path to the newly created export directory
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     export_dir = get_exports_directory() / timestamp
     export_dir.mkdir(parents=True, exist_ok=True)
     return export_dir
@@ -56,7 +61,10 @@ def cleanup_failed_exports() -> None:
 
 def _get_export_subdirectories(exports_dir: Path) -> list:
     """Get all export subdirectories excluding failed_attempts."""
-    return [d for d in exports_dir.iterdir() if d.is_dir() and d.name != "failed_attempts"]
+    # DirEntry type checks use the directory listing, not a stat per entry
+    with os.scandir(exports_dir) as entries:
+        return [Path(entry.path) for entry in entries
+                if entry.name != "failed_attempts" and entry.is_dir()]
 
 
 def _identify_failed_exports(export_subdirs: list) -> list:
@@ -64,7 +72,8 @@ def _identify_failed_exports(export_subdirs: list) -> list:
     failed_dirs = []
     for export_dir in export_subdirs:
         # Check if directory contains any PNG files
-        has_png = any(f.suffix.lower() == '.png' for f in export_dir.iterdir() if f.is_file())
+        with os.scandir(export_dir) as entries:
+            has_png = any(entry.name.lower().endswith('.png') and entry.is_file() for entry in entries)
         if not has_png:
             failed_dirs.append(export_dir)
     return failed_dirs
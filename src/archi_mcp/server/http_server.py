@@ -26,11 +26,10 @@ http_server_running: bool = False
 
 def find_free_port() -> int:
     """Find a free port for HTTP server."""
+    # Binding to port 0 is enough for the OS to assign a port; no need to listen
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind(('', 0))
-        s.listen(1)
-        port = s.getsockname()[1]
-        return port
+        return s.getsockname()[1]
 
 
 def start_http_server():
@@ -14,6 +14,7 @@
 """Language detection and translation utilities for the ArchiMate MCP server."""
 
 from ..i18n import ArchiMateTranslator
+from ..utils.language_detection import LanguageDetector
 from .models import DiagramInput
 
 
@@ -27,15 +28,11 @@ def translate_relationship_labels(diagram, translator: ArchiMateTranslator) -> N
     if translator.get_current_language() == "en":
         return  # Keep original labels for English
 
-    # For non-English languages, use translated relationship types only if no custom label exists
-    for rel in diagram.relationships:
-        if rel.relationship_type:
-            # Only override if no custom label is provided by client
-            if not rel.label:
-                # Get translated relationship type as fallback
-                translated_label = translator.translate_relationship(rel.relationship_type)
-                rel.label = translated_label
-            # If custom label exists, keep it (client knows best)
+    # For non-English languages, use translated relationship types only if no custom label exists;
+    # a custom label provided by the client is kept (client knows best)
+    unlabeled = [rel for rel in diagram.relationships if rel.relationship_type and not rel.label]
+    for rel in unlabeled:
+        rel.label = translator.translate_relationship(rel.relationship_type)
 
 
 def detect_language_from_content(diagram: DiagramInput) -> str:
@@ -47,7 +44,5 @@ def detect_language_from_content(diagram: DiagramInput) -> str:
     Returns:
         str: Detected language code ('en', 'sk', 'ru', 'uk')
     """
-    from ..utils.language_detection import LanguageDetector
-
     # Use the LanguageDetector's method directly
     return LanguageDetector.detect_language_from_content(diagram)
\ No newline at end of file
@@ -14,9 +14,13 @@
 """Main ArchiMate MCP Server implementation."""
 
 import logging
+import threading
 from fastmcp import FastMCP
 
 from ..utils.logging import setup_logging, get_logger
+from .config import is_plantuml_pipe_enabled
+from .plantuml_pipe import warm_up_plantuml_pipes
+from .plantuml_validator import find_plantuml_jar, setup_java_environment
 
 # Initialize MCP server
 mcp = FastMCP("archi-mcp")
@@ -35,8 +39,33 @@ from . import resources  # noqa: F401
 from . import prompts  # noqa: F401
 
 
+def _warm_up_plantuml():
+    """Locate Java and the PlantUML JAR, then warm up the persistent pipes."""
+    # Java probes and a possible JAR download run here, off the startup path
+    java_cmd = setup_java_environment()
+    plantuml_jar = find_plantuml_jar()
+    if not plantuml_jar:
+        logger.warning("PlantUML JAR not found, skipping pipe warm-up")
+        return
+
+    warm_up_plantuml_pipes(java_cmd, plantuml_jar)
+
+
+def _start_plantuml_warmup():
+    """Warm up the persistent PlantUML pipes in the background when enabled."""
+    if not is_plantuml_pipe_enabled():
+        return
+
+    threading.Thread(
+        target=_warm_up_plantuml,
+        name="plantuml-warmup",
+        daemon=True
+    ).start()
+
+
 def main():
     """Main entry point for the ArchiMate MCP server."""
+    _start_plantuml_warmup()
     mcp.run()
 
 
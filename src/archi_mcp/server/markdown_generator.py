@@ -13,140 +13,145 @@
 
 """Markdown documentation generation for ArchiMate diagrams."""
 
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from operator import attrgetter
 from typing import List
 from ..i18n import ArchiMateTranslator
 from ..archimate import ArchiMateGenerator
 
 
-def _add_markdown_header(md_content: list, title: str, description: str, png_filename: str, translator):
-    """Add header section to markdown content."""
-    md_content.append(f"# {title}")
-    md_content.append("")
+@dataclass
+class _MarkdownStats:
+    """Diagram statistics computed once and shared by the markdown helpers."""
+    element_count: int
+    relationship_count: int
+    layer_counts: Counter
+    elements_by_layer: dict
 
-    if description:
-        md_content.append(f"**Description:** {description}")
-        md_content.append("")
 
-    md_content.append(f"![{title}]({png_filename})")
-    md_content.append("")
+def _rel_type_str(relationship_type) -> str:
+    """Return the display string for an enum or plain-string relationship type."""
+    value = getattr(relationship_type, 'value', relationship_type)
+    return value if isinstance(value, str) else str(value)
 
 
-def _add_markdown_overview(md_content: list, generator, translator):
-    """Add overview section with basic statistics."""
-    elements_count = len(generator.elements)
-    relationships_count = len(generator.relationships)
+def _layer_str(layer) -> str:
+    """Return the display string for an enum or plain-string layer."""
+    value = getattr(layer, 'value', None)
+    return value if value is not None else str(layer)
+
+
+def _collect_markdown_stats(generator) -> _MarkdownStats:
+    """Traverse the generator's elements once and collect shared statistics."""
+    elements = generator.elements.values()
+    # Sort by name once; each layer's bucket is then already in table order
+    elements_by_layer = defaultdict(list)
+    for element in sorted(elements, key=attrgetter('name')):
+        elements_by_layer[_layer_str(element.layer)].append(element)
+    return _MarkdownStats(
+        element_count=len(elements),
+        relationship_count=len(generator.relationships),
+        layer_counts=Counter({layer: len(members) for layer, members in elements_by_layer.items()}),
+        elements_by_layer=elements_by_layer,
+    )
+
+
+def _add_markdown_header(md_content: list, title: str, description: str, png_filename: str):
+    """Add header section to markdown content."""
+    header = f"# {title}\n\n"
+    if description:
+        header += f"**Description:** {description}\n\n"
+    md_content.append(f"{header}![{title}]({png_filename})\n")
 
-    md_content.append("## Overview")
-    md_content.append("")
 
+def _add_markdown_overview(md_content: list, stats: _MarkdownStats, translator):
+    """Add overview section with basic statistics."""
     overview_data = [
-        ("Total Elements", elements_count),
-        ("Total Relationships", relationships_count),
+        ("Total Elements", stats.element_count),
+        ("Total Relationships", stats.relationship_count),
     ]
 
-    # Count elements by layer
-    layer_counts = {}
-    for element in generator.elements.values():
-        layer = element.layer.value if hasattr(element.layer, 'value') else str(element.layer)
-        layer_counts[layer] = layer_counts.get(layer, 0) + 1
-
-    for layer, count in sorted(layer_counts.items()):
+    for layer, count in sorted(stats.layer_counts.items()):
         overview_data.append((f"{layer} Elements", count))
 
     # Create table
-    md_content.append("| Metric | Count |")
-    md_content.append("|--------|-------|")
-    for metric, count in overview_data:
-        md_content.append(f"| {metric} | {count} |")
-    md_content.append("")
+    rows = "".join(f"| {metric} | {count} |\n" for metric, count in overview_data)
+    md_content.append(f"## Overview\n\n| Metric | Count |\n|--------|-------|\n{rows}")
 
 
-def _add_elements_by_layer(md_content: list, generator, translator):
+def _add_elements_by_layer(md_content: list, stats: _MarkdownStats, translator):
     """Add detailed elements section organized by layer."""
-    md_content.append("## Elements by Layer")
-    md_content.append("")
-
-    layers = _group_elements_by_layer(generator)
+    layers = stats.elements_by_layer
+    md_content.append("\n".join([
+        "## Elements by Layer\n",
+        *(_generate_layer_section(layer_name, layers[layer_name]) for layer_name in sorted(layers)),
+    ]))
 
-    for layer_name in sorted(layers.keys()):
-        _generate_layer_section(md_content, layer_name, layers[layer_name])
 
+def _generate_layer_section(layer_name: str, elements: list) -> str:
+    """Generate markdown section for a specific layer from name-sorted elements."""
+    section = f"### {layer_name} Layer\n\n"
 
-def _group_elements_by_layer(generator):
-    """Group elements by their ArchiMate layer."""
-    layers = {}
-    for element in generator.elements.values():
-        layer = element.layer.value if hasattr(element.layer, 'value') else str(element.layer)
-        if layer not in layers:
-            layers[layer] = []
-        layers[layer].append(element)
-    return layers
+    if elements:
+        rows = "\n".join(
+            f"| {element.name} | {element.element_type} | {_short_description(element.description)} |"
+            for element in elements
+        )
+        section += f"| Element | Type | Description |\n|---------|------|-------------|\n{rows}\n"
 
+    return section
 
-def _generate_layer_section(md_content: list, layer_name: str, elements: list):
-    """Generate markdown section for a specific layer."""
-    md_content.append(f"### {layer_name} Layer")
-    md_content.append("")
 
-    if elements:
-        md_content.append("| Element | Type | Description |")
-        md_content.append("|---------|------|-------------|")
+def _short_description(description) -> str:
+    """Truncate an element description for table display."""
+    if description and len(description) > 50:
+        return description[:50] + "..."
+    return description or ""
 
-        for element in sorted(elements, key=lambda x: x.name):
-            desc = element.description[:50] + "..." if element.description and len(element.description) > 50 else (element.description or "")
-            md_content.append(f"| {element.name} | {element.element_type} | {desc} |")
 
-    md_content.append("")
+def _element_name(elements: dict, element_id: str) -> str:
+    """Resolve an element ID to its display name, falling back to the ID."""
+    element = elements.get(element_id)
+    return element.name if element is not None else element_id
 
 
 def _add_relationships_section(md_content: list, generator, translator):
     """Add relationships section."""
-    md_content.append("## Relationships")
-    md_content.append("")
+    section = "## Relationships\n\n"
 
     if generator.relationships:
-        md_content.append("| Source | Relationship | Target |")
-        md_content.append("|--------|--------------|--------|")
-
-        for rel in generator.relationships:
-            source_name = generator.elements[rel.source_id].name if rel.source_id in generator.elements else rel.source_id
-            target_name = generator.elements[rel.target_id].name if rel.target_id in generator.elements else rel.target_id
-            rel_type = rel.relationship_type.value if hasattr(rel.relationship_type, 'value') else str(rel.relationship_type)
+        elements = generator.elements
+        rows = "\n".join(
+            f"| {_element_name(elements, rel.from_element)} | {_rel_type_str(rel.relationship_type)} | {_element_name(elements, rel.to_element)} |"
+            for rel in generator.relationships
+        )
+        section += f"| Source | Relationship | Target |\n|--------|--------------|--------|\n{rows}\n"
 
-            md_content.append(f"| {source_name} | {rel_type} | {target_name} |")
-
-    md_content.append("")
+    md_content.append(section)
 
 
 def _add_architecture_insights(md_content: list, generator, translator):
     """Add architecture insights and recommendations."""
-    md_content.append("## Architecture Insights")
-    md_content.append("")
-
     insights = _generate_insights_content(generator)
-
-    if insights:
-        md_content.extend(insights)
-    else:
-        md_content.append("No specific insights available for this architecture.")
-
-    md_content.append("")
+    body = "\n".join(insights) if insights else "No specific insights available for this architecture."
+    md_content.append(f"## Architecture Insights\n\n{body}\n")
 
 
 def _generate_insights_content(generator) -> list:
     """Generate insights content from relationship and connectivity analysis."""
     insights = []
+    rel_types, element_connections = _analyze_relationships(generator)
 
     # Relationship type analysis
-    rel_types = _analyze_relationship_types(generator)
     if rel_types:
         insights.append("### Relationship Analysis")
         insights.append("")
-        for rel_type, count in sorted(rel_types.items(), key=lambda x: x[1], reverse=True):
+        for rel_type, count in rel_types.most_common():
             insights.append(f"- **{rel_type}**: {count} relationship{'s' if count != 1 else ''}")
 
     # Element connectivity analysis
-    most_connected = _analyze_element_connectivity(generator)
+    most_connected = _most_connected_elements(generator, element_connections)
     if most_connected:
         insights.append("")
         insights.append("### Most Connected Elements")
@@ -157,28 +162,21 @@ def _generate_insights_content(generator) -> list:
     return insights
 
 
-def _analyze_relationship_types(generator) -> dict:
-    """Analyze and count different relationship types."""
-    rel_types = {}
-    for rel in generator.relationships:
-        rel_type = rel.relationship_type.value if hasattr(rel.relationship_type, 'value') else str(rel.relationship_type)
-        rel_types[rel_type] = rel_types.get(rel_type, 0) + 1
-    return rel_types
-
-
-def _analyze_element_connectivity(generator) -> list:
-    """Analyze element connectivity and return most connected elements."""
-    element_connections = {}
+def _analyze_relationships(generator) -> tuple:
+    """Count relationship types and per-element connections in one pass."""
+    rel_types = Counter()
+    element_connections = Counter()
     for rel in generator.relationships:
-        for elem_id in [rel.source_id, rel.target_id]:
-            element_connections[elem_id] = element_connections.get(elem_id, 0) + 1
+        rel_types[_rel_type_str(rel.relationship_type)] += 1
+        element_connections[rel.from_element] += 1
+        element_connections[rel.to_element] += 1
+    return rel_types, element_connections
 
-    if not element_connections:
-        return []
 
-    most_connected = sorted(element_connections.items(), key=lambda x: x[1], reverse=True)[:5]
+def _most_connected_elements(generator, element_connections: Counter) -> list:
+    """Return the names and connection counts of the most connected elements."""
     result = []
-    for elem_id, connections in most_connected:
+    for elem_id, connections in element_connections.most_common(5):
         if elem_id in generator.elements:
             elem_name = generator.elements[elem_id].name
             result.append((elem_name, connections))
@@ -187,23 +185,24 @@ def _analyze_element_connectivity(generator) -> list:
 
 def _add_markdown_footer(md_content: list, translator):
     """Add footer with generation information."""
-    md_content.append("---")
-    md_content.append("")
-    md_content.append("*Generated by ArchiMate MCP Server*")
-    md_content.append("")
+    md_content.append("---\n\n*Generated by ArchiMate MCP Server*\n")
 
 
 def generate_architecture_markdown(generator, title: str, description: str, png_filename: str = "diagram.png") -> str:
     """Generate comprehensive markdown documentation for an ArchiMate diagram."""
+    # One pre-formatted string per section, joined once at the end
     md_content = []
 
     # Get translator (default to English if none provided)
-    translator = generator.translator if hasattr(generator, 'translator') and generator.translator else ArchiMateTranslator("en")
+    translator = getattr(generator, 'translator', None) or ArchiMateTranslator("en")
+
+    # Traverse elements once; every section reads from the shared statistics
+    stats = _collect_markdown_stats(generator)
 
     # Add all sections
-    _add_markdown_header(md_content, title, description, png_filename, translator)
-    _add_markdown_overview(md_content, generator, translator)
-    _add_elements_by_layer(md_content, generator, translator)
+    _add_markdown_header(md_content, title, description, png_filename)
+    _add_markdown_overview(md_content, stats, translator)
+    _add_elements_by_layer(md_content, stats, translator)
     _add_relationships_section(md_content, generator, translator)
     _add_architecture_insights(md_content, generator, translator)
     _add_markdown_footer(md_content, translator)
@@ -215,22 +214,15 @@ def _generate_detailed_description(generator, title: str, translator=None) -> st
     """Generate detailed description of the architecture."""
     if not translator:
         translator = ArchiMateTranslator("en")
+    stats = _collect_markdown_stats(generator)
 
-    elements_count = len(generator.elements)
-    relationships_count = len(generator.relationships)
-
-    description = f"This {title} contains {elements_count} elements and {relationships_count} relationships across the ArchiMate framework."
+    description = f"This {title} contains {stats.element_count} elements and {stats.relationship_count} relationships across the ArchiMate framework."
 
     # Add layer breakdown
-    layer_counts = {}
-    for element in generator.elements.values():
-        layer = element.layer.value if hasattr(element.layer, 'value') else str(element.layer)
-        layer_counts[layer] = layer_counts.get(layer, 0) + 1
-
-    if layer_counts:
-        layer_desc = []
-        for layer, count in sorted(layer_counts.items()):
-            layer_desc.append(f"{count} {layer.lower()} elements")
-        description += f" It includes {', '.join(layer_desc)}."
+    if stats.layer_counts:
+        layer_desc = ", ".join(
+            f"{count} {layer.lower()} elements" for layer, count in sorted(stats.layer_counts.items())
+        )
+        description += f" It includes {layer_desc}."
 
     return description
\ No newline at end of file
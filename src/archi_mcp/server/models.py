@@ -203,4 +203,19 @@ class DiagramInput(BaseModel):
         """Validate that all groups reference existing parent groups."""
         for group in self.groups:
             if group.parent_group_id and group.parent_group_id not in group_ids:
-                raise ValueError(f"Group '{group.id}' references unknown parent group '{group.parent_group_id}'")
\ No newline at end of file
+                raise ValueError(f"Group '{group.id}' references unknown parent group '{group.parent_group_id}'")
+
+
+def _prewarm() -> None:
+    """Run the DiagramInput validators once so the first request skips their first-use setup.
+
+    The sample diagram is valid, so a failure here means the model itself is
+    broken and is raised at import instead of on the first request.
+    """
+    DiagramInput.model_validate_json(
+        b'{"title": "", "elements": [{"id": "e", "name": "E", "element_type": "Business_Actor",'
+        b' "layer": "Business"}], "relationships": []}'
+    )
+
+
+_prewarm()
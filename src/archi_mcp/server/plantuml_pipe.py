@@ -0,0 +1,198 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18T11:40:31
+# Last Updated: 2025-12-18T11:40:31
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""Long-lived PlantUML ``-pipe`` processes that keep one warm JVM per output format."""
+
+import atexit
+import subprocess
+import threading
+from typing import Dict, Optional, Tuple
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Written by PlantUML after every rendered diagram so the reader knows where it ends
+PIPE_DELIMITER = b"___ARCHI_MCP_PLANTUML_END___"
+
+# With -pipeNoStderr, a failed diagram still yields an (error) image, and the
+# error is written to stdout as "ERROR", the line number and the messages
+PIPE_ERROR_MARKER = b"ERROR"
+
+# Bytes that close an image, after which only an error block can follow
+_IMAGE_END_MARKERS = {
+    "png": b"IEND\xaeB`\x82",
+    "svg": b"</svg>",
+}
+
+
+class PlantUMLPipeError(RuntimeError):
+    """PlantUML reported an error for a diagram rendered through a pipe."""
+
+    def __init__(self, message: str, line_number: Optional[int] = None):
+        super().__init__(message)
+        self.line_number = line_number
+
+
+class PlantUMLPipe:
+    """A persistent ``java -jar plantuml.jar -pipe`` process for one output format.
+
+    Diagram sources are streamed to stdin and the rendered image is read back from
+    stdout up to the pipe delimiter. Requests are serialized with a lock because the
+    process has a single stdin/stdout pair. A dead process is respawned on next use.
+    """
+
+    def __init__(self, java_cmd: str, plantuml_jar: str, output_format: str):
+        self.java_cmd = java_cmd
+        self.plantuml_jar = plantuml_jar
+        self.output_format = output_format
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _command(self) -> list:
+        """Build the PlantUML pipe-mode command line."""
+        return [
+            self.java_cmd, '-Djava.awt.headless=true', '-jar', self.plantuml_jar,
+            '-pipe', '-pipeNoStderr', f'-t{self.output_format}',
+            '-pipedelimitor', PIPE_DELIMITER.decode('ascii'),
+        ]
+
+    def _ensure_process(self) -> subprocess.Popen:
+        """Start the pipe process, or restart it if it has exited."""
+        if self._process is None or self._process.poll() is not None:
+            logger.debug("Starting PlantUML pipe process for {}", self.output_format)
+            self._process = subprocess.Popen(
+                self._command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        return self._process
+
+    def render(self, plantuml_code: str, timeout: float = 60) -> bytes:
+        """Render PlantUML source and return the image bytes.
+
+        Raises:
+            PlantUMLPipeError: If PlantUML reported an error for the source;
+                the process stays usable for the next diagram.
+        """
+        with self._lock:
+            process = self._ensure_process()
+            # A hung render is killed, which unblocks the read below with EOF
+            watchdog = threading.Timer(timeout, process.kill)
+            watchdog.start()
+            try:
+                source = plantuml_code if plantuml_code.endswith("\n") else plantuml_code + "\n"
+                process.stdin.write(source.encode('utf-8'))
+                process.stdin.flush()
+                output = _read_until_delimiter(process.stdout)
+            except Exception:
+                # The stream position is unknown after a failure; never reuse it
+                process.kill()
+                self._process = None
+                raise
+            finally:
+                watchdog.cancel()
+        return _check_render_output(output, self.output_format)
+
+    def close(self) -> None:
+        """Terminate the pipe process if it is running."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def _read_until_delimiter(stream) -> bytes:
+    """Read one rendered diagram from a pipe-mode stdout stream."""
+    chunks = []
+    while True:
+        line = stream.readline()
+        if not line:
+            raise RuntimeError("PlantUML pipe closed before the diagram was rendered")
+        stripped = line.rstrip(b"\r\n")
+        if stripped.endswith(PIPE_DELIMITER):
+            chunks.append(stripped[:-len(PIPE_DELIMITER)])
+            return b"".join(chunks)
+        chunks.append(line)
+
+
+def _check_render_output(output: bytes, output_format: str) -> bytes:
+    """Return the image from one pipe render, raising if PlantUML reported an error."""
+    if output.startswith(PIPE_ERROR_MARKER):
+        error_block = output
+    else:
+        end_marker = _IMAGE_END_MARKERS.get(output_format)
+        end = output.rfind(end_marker) if end_marker else -1
+        if end == -1:
+            return output
+        end += len(end_marker)
+        error_block = output[end:].lstrip()
+        if not error_block.startswith(PIPE_ERROR_MARKER):
+            return output
+    raise _parse_error_block(error_block)
+
+
+def _parse_error_block(error_block: bytes) -> PlantUMLPipeError:
+    """Build the error for an ``ERROR`` / line number / message block."""
+    lines = error_block.decode('utf-8', errors='replace').splitlines()[1:3]
+    line_number = int(lines[0]) if lines and lines[0].strip().isdigit() else None
+    message = lines[1].strip() if len(lines) > 1 and lines[1].strip() else "Syntax Error?"
+    if line_number is not None:
+        return PlantUMLPipeError(f"Error line {line_number}: {message}", line_number)
+    return PlantUMLPipeError(message)
+
+
+_pipes: Dict[Tuple[str, str, str], PlantUMLPipe] = {}
+_pipes_lock = threading.Lock()
+
+
+def get_plantuml_pipe(java_cmd: str, plantuml_jar: str, output_format: str) -> PlantUMLPipe:
+    """Return the shared pipe for a Java command, JAR and output format."""
+    key = (java_cmd, plantuml_jar, output_format)
+    with _pipes_lock:
+        pipe = _pipes.get(key)
+        if pipe is None:
+            pipe = _pipes[key] = PlantUMLPipe(java_cmd, plantuml_jar, output_format)
+        return pipe
+
+
+# Smallest diagram that exercises the parser and the image writer
+_WARMUP_DIAGRAM = "@startuml\nrectangle Warmup\n@enduml"
+
+
+def warm_up_plantuml_pipes(java_cmd: str, plantuml_jar: str) -> None:
+    """Start the pipe processes and render a trivial diagram in each.
+
+    This moves JVM startup and first-use class loading out of the first
+    diagram request. Failures are only logged; requests fall back as usual.
+    """
+    for output_format in ("png", "svg"):
+        try:
+            get_plantuml_pipe(java_cmd, plantuml_jar, output_format).render(_WARMUP_DIAGRAM)
+            logger.debug("PlantUML {} pipe warmed up", output_format)
+        except Exception as e:
+            logger.warning("Could not warm up PlantUML {} pipe: {}", output_format, e)
+
+
+def shutdown_plantuml_pipes() -> None:
+    """Terminate all shared pipe processes."""
+    with _pipes_lock:
+        pipes = list(_pipes.values())
+        _pipes.clear()
+    for pipe in pipes:
+        pipe.close()
+
+
+atexit.register(shutdown_plantuml_pipes)
@@ -13,33 +13,80 @@
 
 """PlantUML validation and image generation utilities."""
 
+import functools
+import glob
+import shutil
 import subprocess
 import time
 import platform
 import os
+import re
 import tempfile
+import threading
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 
+from .config import is_plantuml_pipe_enabled
+from .plantuml_pipe import PlantUMLPipeError, get_plantuml_pipe
 
-def setup_java_environment():
-    """Setup Java environment variables for PlantUML execution."""
-    _setup_java_home()
-    _setup_java_path()
 
+# JVM options favouring fast startup for short-lived PlantUML runs: C1-only JIT,
+# the single-threaded collector and the default class data sharing archive
+PLANTUML_ONESHOT_JVM_OPTIONS = (
+    '-Djava.awt.headless=true',
+    '-XX:TieredStopAtLevel=1',
+    '-XX:+UseSerialGC',
+    '-Xshare:auto',
+)
 
-def _setup_java_home():
+
+def build_plantuml_command(java_cmd: str, plantuml_jar: str, *args: str) -> list:
+    """Build a one-shot PlantUML command line with startup-tuned JVM options."""
+    return [java_cmd, *PLANTUML_ONESHOT_JVM_OPTIONS, '-jar', plantuml_jar, *args]
+
+
+# JAVA_HOME and PATH as the last setup left them; while they are unchanged there is nothing to redo
+_java_environment: Optional[Tuple[Optional[str], str]] = None
+
+# Java executable located by the last setup
+_java_executable = "java"
+
+
+def _current_java_environment() -> Tuple[Optional[str], str]:
+    return os.getenv("JAVA_HOME"), os.environ.get("PATH", "")
+
+
+def setup_java_environment() -> str:
+    """Setup Java environment variables for PlantUML execution.
+
+    The Java lookup is skipped while JAVA_HOME and PATH still hold the
+    values a previous call left behind.
+
+    Returns:
+        The Java executable to run PlantUML with
+    """
+    global _java_environment, _java_executable
+    if _java_environment == _current_java_environment():
+        return _java_executable
+
+    java_path = _find_java_executable()
+    _setup_java_home(java_path)
+    _setup_java_path(java_path)
+    _java_executable = java_path
+    _java_environment = _current_java_environment()
+    return java_path
+
+
+def _setup_java_home(java_path: str):
     """Ensure JAVA_HOME is set if we can find it."""
     if not os.getenv("JAVA_HOME"):
-        java_path = _find_java_executable()
         if java_path and java_path != "java":
             java_home = os.path.dirname(os.path.dirname(java_path))
             os.environ["JAVA_HOME"] = java_home
 
 
-def _setup_java_path():
+def _setup_java_path(java_path: str):
     """Ensure Java bin directory is in PATH."""
-    java_path = _find_java_executable()
     if java_path and java_path != "java":
         java_bin_dir = os.path.dirname(java_path)
         current_path = os.environ.get("PATH", "")
@@ -47,17 +94,43 @@ def _setup_java_path():
             os.environ["PATH"] = java_bin_dir + os.pathsep + current_path
 
 
+# Diagram delimiters, collected in one scan over the source
+_PUML_MARKER_RE = re.compile(r"@startuml|@enduml")
+
+
+def check_plantuml_structure(plantuml_code: str) -> Tuple[bool, str]:
+    """Cheap structural check run before paying for a Java process."""
+    if not plantuml_code or not plantuml_code.strip():
+        return False, "PlantUML code is empty"
+
+    found = set(_PUML_MARKER_RE.findall(plantuml_code))
+    missing = [marker for marker in ("@startuml", "@enduml") if marker not in found]
+    if missing:
+        return False, f"PlantUML code is missing {' and '.join(missing)}"
+
+    return True, ""
+
+
 def validate_plantuml_renders(plantuml_code: str) -> Tuple[bool, str]:
     """Validate that PlantUML code can be rendered successfully."""
+    structure_ok, structure_error = check_plantuml_structure(plantuml_code)
+    if not structure_ok:
+        return False, f"PlantUML rendering failed: {structure_error}"
+
     try:
-        # Setup Java environment
-        setup_java_environment()
+        # Setup Java environment; the pipe and the one-shot run use the same executable
+        java_cmd = setup_java_environment()
 
         # Find PlantUML jar
         plantuml_jar = find_plantuml_jar()
         if not plantuml_jar:
             return False, "PlantUML JAR file not found. Please install PlantUML."
 
+        if is_plantuml_pipe_enabled():
+            piped_result = _validate_via_pipe(plantuml_code, java_cmd, plantuml_jar)
+            if piped_result is not None:
+                return piped_result
+
         # Create temporary file for PlantUML code
         with tempfile.NamedTemporaryFile(mode='w', suffix='.puml', delete=False) as temp_file:
             temp_file.write(plantuml_code)
@@ -67,27 +140,25 @@ def validate_plantuml_renders(plantuml_code: str) -> Tuple[bool, str]:
             # Create temporary output file
             output_file = temp_file_path.replace('.puml', '.png')
 
-            # Run PlantUML - try to find Java in common locations
-            java_cmd = _find_java_executable()
-            cmd = [java_cmd, '-jar', plantuml_jar, '-tpng', temp_file_path]
+            # Run PlantUML
+            cmd = build_plantuml_command(java_cmd, plantuml_jar, '-tpng', temp_file_path)
+            # The image goes to a file, so only stderr is kept for error messages
             process = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
                 text=True,
                 env=os.environ.copy()  # Use current environment
             )
 
-            # Wait for process completion with timeout
+            # Wait for process completion with timeout, draining stderr so a
+            # chatty run cannot fill the pipe and stall
             try:
-                process.wait(timeout=30)
+                _, stderr = process.communicate(timeout=30)
             except subprocess.TimeoutExpired:
                 process.kill()
                 raise subprocess.TimeoutExpired(cmd, timeout=30)
 
-            # Get process output
-            stdout, stderr = process.communicate()
-
             # Check if output file was created
             if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
                 os.remove(output_file)  # Clean up
@@ -98,8 +169,7 @@ def validate_plantuml_renders(plantuml_code: str) -> Tuple[bool, str]:
 
         finally:
             # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
+            Path(temp_file_path).unlink(missing_ok=True)
 
     except subprocess.TimeoutExpired:
         return False, "PlantUML rendering timed out (30 seconds)"
@@ -114,25 +184,90 @@ def validate_plantuml_renders(plantuml_code: str) -> Tuple[bool, str]:
         return False, f"PlantUML validation error: {str(e)}"
 
 
+def _validate_via_pipe(plantuml_code: str, java_cmd: str, plantuml_jar: str) -> Optional[Tuple[bool, str]]:
+    """Render through the warm PNG pipe shared with image generation.
+
+    Returns None when the pipe itself fails, so the caller can fall back to a
+    one-shot PlantUML process.
+    """
+    try:
+        png_bytes = get_plantuml_pipe(java_cmd, plantuml_jar, 'png').render(plantuml_code, timeout=30)
+    except PlantUMLPipeError as e:
+        return False, f"PlantUML rendering failed: {e}"
+    except Exception:
+        return None
+    if png_bytes:
+        return True, "PlantUML code renders successfully"
+    return False, "PlantUML rendering failed: empty output from PlantUML pipe"
+
+
+# PNG signature followed by the IHDR chunk length (13) and type
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_IHDR_PREFIX = b"\x00\x00\x00\x0dIHDR"
+PNG_HEADER_SIZE = len(PNG_SIGNATURE) + len(PNG_IHDR_PREFIX)
+
+# Per-thread header buffer reused across validations
+_png_header_local = threading.local()
+
+
+def _get_png_header_buffer() -> bytearray:
+    """Return this thread's reusable PNG header buffer."""
+    buf = getattr(_png_header_local, "buf", None)
+    if buf is None:
+        buf = _png_header_local.buf = bytearray(PNG_HEADER_SIZE)
+    return buf
+
+
 def validate_png_file(png_file_path: Path) -> Tuple[bool, str]:
-    """Validate that PNG file exists and has reasonable size."""
+    """Validate that PNG file exists, has reasonable size and a PNG header."""
     try:
-        if not png_file_path.exists():
+        try:
+            file_size = os.stat(png_file_path).st_size
+        except FileNotFoundError:
             return False, f"PNG file not found: {png_file_path}"
 
-        file_size = png_file_path.stat().st_size
         if file_size < 100:  # Very small file indicates error
             return False, f"PNG file too small ({file_size} bytes), likely rendering error"
 
         if file_size > 50 * 1024 * 1024:  # 50MB limit
             return False, f"PNG file too large ({file_size} bytes), likely rendering error"
 
+        # Signature and IHDR chunk header are checked from a single read
+        buf = _get_png_header_buffer()
+        with open(png_file_path, "rb") as f:
+            read = f.readinto(buf)
+        header = memoryview(buf)[:read]
+        if header[:len(PNG_SIGNATURE)] != PNG_SIGNATURE:
+            return False, "PNG file has an invalid signature, likely rendering error"
+        if header[len(PNG_SIGNATURE):] != PNG_IHDR_PREFIX:
+            return False, "PNG file is missing the IHDR chunk, likely rendering error"
+
         return True, f"PNG file valid ({file_size} bytes)"
 
     except Exception as e:
         return False, f"PNG validation error: {str(e)}"
 
 
+# An SVG root element appears after at most an XML declaration and a comment
+SVG_PREFIX_SIZE = 256
+
+
+def validate_svg_file(svg_file_path: Path) -> Tuple[bool, str]:
+    """Validate that SVG file exists and starts with an SVG root element."""
+    try:
+        with open(svg_file_path, "rb") as f:
+            prefix = f.read(SVG_PREFIX_SIZE)
+    except FileNotFoundError:
+        return False, f"SVG file not found: {svg_file_path}"
+    except OSError as e:
+        return False, f"SVG validation error: {str(e)}"
+
+    if b"<svg" not in prefix:
+        return False, "SVG file has no <svg> root element, likely rendering error"
+
+    return True, "SVG file valid"
+
+
 def _find_java_executable() -> str:
     """Find Java executable in common locations."""
     # First, try JAVA_HOME environment variable
@@ -153,26 +288,39 @@ def _find_java_executable() -> str:
     return "java"  # Fallback to PATH
 
 
+@functools.lru_cache(maxsize=32)
+def _probe_java(java_path: str, mtime: float) -> bool:
+    """Run ``java -version`` once per executable and modification time."""
+    try:
+        result = subprocess.run([java_path, "-version"],
+                              capture_output=True, text=True, timeout=5)
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return False
+    return result.returncode == 0
+
+
+def _java_runs(java_path: str) -> bool:
+    """Check that a Java executable starts, reusing earlier probe results."""
+    try:
+        mtime = os.stat(java_path).st_mtime
+    except OSError:
+        return False
+    return _probe_java(java_path, mtime)
+
+
 def _check_java_home_locations() -> str:
     """Check for Java in JAVA_HOME environment variable."""
     java_home = os.getenv("JAVA_HOME")
     if java_home:
         java_path = os.path.join(java_home, "bin", "java")
         if os.path.exists(java_path) and os.access(java_path, os.X_OK):
-            try:
-                result = subprocess.run([java_path, "-version"],
-                                      capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    return java_path
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                pass
+            if _java_runs(java_path):
+                return java_path
     return ""
 
 
 def _check_common_java_locations() -> str:
     """Try common Java paths for macOS and Linux."""
-    import shutil
-
     java_paths = [
         "/opt/homebrew/opt/openjdk/bin/java",          # Homebrew OpenJDK (Apple Silicon)
         "/usr/local/opt/openjdk/bin/java",             # Homebrew OpenJDK (Intel)
@@ -192,28 +340,18 @@ def _check_common_java_locations() -> str:
     ]
 
     for java_path in java_paths:
-        try:
-            if os.path.isabs(java_path):
-                if os.path.exists(java_path) and os.access(java_path, os.X_OK):
-                    result = subprocess.run([java_path, "-version"],
-                                          capture_output=True, text=True, timeout=5)
-                    if result.returncode == 0:
-                        return java_path
-            else:
-                found_path = shutil.which(java_path)
-                if found_path:
-                    result = subprocess.run([found_path, "-version"],
-                                          capture_output=True, text=True, timeout=5)
-                    if result.returncode == 0:
-                        return found_path
-        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-            continue
+        if os.path.isabs(java_path):
+            if os.path.exists(java_path) and os.access(java_path, os.X_OK) and _java_runs(java_path):
+                return java_path
+        else:
+            found_path = shutil.which(java_path)
+            if found_path and _java_runs(found_path):
+                return found_path
     return ""
 
 
 def _check_java_from_path() -> str:
     """Last resort: try to find java in common directories using glob patterns."""
-    import glob
     for pattern in [
         "/usr/lib/jvm/*/bin/java",
         "/Library/Java/JavaVirtualMachines/*/Contents/Home/bin/java",
@@ -221,21 +359,42 @@ def _check_java_from_path() -> str:
     ]:
         matches = glob.glob(pattern)
         for match in matches:
-            if os.path.exists(match) and os.access(match, os.X_OK):
-                try:
-                    result = subprocess.run([match, "-version"],
-                                          capture_output=True, text=True, timeout=5)
-                    if result.returncode == 0:
-                        return match
-                except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-                    continue
+            if os.path.exists(match) and os.access(match, os.X_OK) and _java_runs(match):
+                return match
     return ""
 
 
+# Located JAR paths keyed by (PLANTUML_JAR, working directory), the inputs of the search
+_plantuml_jar_cache: Dict[Tuple[Optional[str], str], str] = {}
+
+
+def clear_plantuml_jar_cache() -> None:
+    """Forget located JAR paths, e.g. after installing PlantUML elsewhere."""
+    _plantuml_jar_cache.clear()
+
+
 def find_plantuml_jar(debug_log: list = None) -> str:
-    """Find PlantUML JAR file in common locations."""
-    import tempfile
+    """Find PlantUML JAR file in common locations.
 
+    A located path is reused for later calls with the same ``PLANTUML_JAR``
+    and working directory for as long as the file still exists.
+    """
+    env_path = os.getenv("PLANTUML_JAR")
+    cache_key = (env_path, os.getcwd())
+    cached_path = _plantuml_jar_cache.get(cache_key)
+    if cached_path is not None and os.path.isfile(cached_path):
+        if debug_log is not None:
+            debug_log.append(f"Found PlantUML JAR: {cached_path}")
+        return cached_path
+
+    jar_path = _search_plantuml_jar(env_path, debug_log)
+    if jar_path:
+        _plantuml_jar_cache[cache_key] = jar_path
+    return jar_path
+
+
+def _search_plantuml_jar(env_path: Optional[str], debug_log: list = None) -> str:
+    """Search the common locations for the PlantUML JAR, downloading it as a last resort."""
     # Common installation locations
     search_paths = [
         # User home directory
@@ -264,7 +423,6 @@ def find_plantuml_jar(debug_log: list = None) -> str:
     ])
 
     # Check environment variable
-    env_path = os.getenv("PLANTUML_JAR")
     if env_path:
         search_paths.insert(0, Path(env_path))
 
@@ -0,0 +1,177 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18T11:40:31
+# Last Updated: 2025-12-18T11:40:31
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""On-disk cache of rendered diagram images keyed by the PlantUML source."""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .config import get_env_setting, is_render_cache_enabled
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+PNG_NAME = "diagram.png"
+SVG_NAME = "diagram.svg"
+
+# Stores between full rescans of the cache size, which also picks up
+# entries written by other server processes
+EVICTION_RESCAN_INTERVAL = 100
+
+# Cache size as of the last scan plus everything stored since; None until the first scan
+_cache_size: Optional[int] = None
+_stores_since_scan = 0
+_cache_size_lock = threading.Lock()
+
+
+def get_render_cache_directory() -> Path:
+    """Get the root directory of the render cache."""
+    return Path.home() / ".cache" / "archi-mcp"
+
+
+def _jar_identity(plantuml_jar: str) -> str:
+    """Identify the PlantUML build by its resolved path, size and modification time."""
+    jar_path = os.path.realpath(plantuml_jar)
+    try:
+        stat = os.stat(jar_path)
+    except OSError:
+        return jar_path
+    return f"{jar_path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def render_cache_key(plantuml_code: str, plantuml_jar: str) -> str:
+    """Hash PlantUML source and the rendering JAR into a cache key.
+
+    Layout options are emitted into the PlantUML source, so the source and
+    the PlantUML build together identify the rendered output; switching or
+    upgrading the JAR starts from fresh entries.
+    """
+    key = hashlib.blake2b(plantuml_code.encode('utf-8'), digest_size=16)
+    key.update(b"\0" + _jar_identity(plantuml_jar).encode('utf-8'))
+    return key.hexdigest()
+
+
+def _entry_directory(key: str) -> Path:
+    """Get the cache entry directory for a key."""
+    return get_render_cache_directory() / key[:2] / key
+
+
+def get_cached_render(plantuml_code: str, plantuml_jar: str) -> Optional[Tuple[Path, Path]]:
+    """Return cached (png, svg) paths for the source, or None on a miss.
+
+    Only an entry holding both images is a hit.
+    """
+    if not is_render_cache_enabled():
+        return None
+
+    entry = _entry_directory(render_cache_key(plantuml_code, plantuml_jar))
+    png_path = entry / PNG_NAME
+    svg_path = entry / SVG_NAME
+    if not (png_path.is_file() and svg_path.is_file()):
+        return None
+
+    # Mark the entry as recently used for eviction
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+
+    return png_path, svg_path
+
+
+def store_render(plantuml_code: str, plantuml_jar: str, png_path: str, svg_path: Optional[str]) -> None:
+    """Copy freshly rendered images into the cache. Failures are only logged.
+
+    Callers store only images that PlantUML rendered without reporting an
+    error; a cached error image would be served for the source forever.
+    A render without an SVG is not stored, so a later request can still
+    produce the SVG instead of being served the PNG alone.
+    """
+    if not is_render_cache_enabled() or not svg_path:
+        return
+
+    try:
+        entry = _entry_directory(render_cache_key(plantuml_code, plantuml_jar))
+        entry.mkdir(parents=True, exist_ok=True)
+        stored_bytes = _copy_into_entry(svg_path, entry / SVG_NAME)
+        stored_bytes += _copy_into_entry(png_path, entry / PNG_NAME)
+        _track_stored_bytes(stored_bytes)
+    except OSError as e:
+        logger.debug("Could not store rendered images in cache: {}", e)
+
+
+def _copy_into_entry(src: str, dst: Path) -> int:
+    """Copy a file into a cache entry atomically and return its size.
+
+    The copy is written to a temporary file in the entry directory and
+    renamed into place, so readers never see a partially written image.
+    """
+    fd, temp_path = tempfile.mkstemp(prefix=f".{dst.name}.", dir=dst.parent)
+    os.close(fd)
+    try:
+        shutil.copyfile(src, temp_path)
+        size = os.stat(temp_path).st_size
+        os.replace(temp_path, dst)
+    except OSError:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    return size
+
+
+def _track_stored_bytes(stored_bytes: int) -> None:
+    """Account for a stored entry and evict only when the cap may be exceeded."""
+    global _cache_size, _stores_since_scan
+    try:
+        max_bytes = int(get_env_setting("ARCHI_MCP_RENDER_CACHE_MAX_MB")) * 1024 * 1024
+    except ValueError:
+        return
+
+    with _cache_size_lock:
+        _stores_since_scan += 1
+        if _cache_size is not None:
+            _cache_size += stored_bytes
+            if _cache_size <= max_bytes and _stores_since_scan < EVICTION_RESCAN_INTERVAL:
+                return
+        _cache_size = _evict_old_entries(max_bytes)
+        _stores_since_scan = 0
+
+
+def _evict_old_entries(max_bytes: int) -> int:
+    """Remove least recently used entries while the cache exceeds its size cap.
+
+    Returns:
+        The total size of the cache after eviction
+    """
+    entries = []
+    total_size = 0
+    for entry in get_render_cache_directory().glob("*/*"):
+        if not entry.is_dir():
+            continue
+        size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+        entries.append((entry.stat().st_mtime, size, entry))
+        total_size += size
+
+    if total_size <= max_bytes:
+        return total_size
+
+    for _, size, entry in sorted(entries, key=lambda item: item[0]):
+        shutil.rmtree(entry, ignore_errors=True)
+        total_size -= size
+        if total_size <= max_bytes:
+            break
+    return total_size
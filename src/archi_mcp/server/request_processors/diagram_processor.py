@@ -15,6 +15,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import json
 import tempfile
@@ -25,12 +26,9 @@ import platform
 import threading
 import socket
 from pathlib import Path
-from typing import Dict, List, Optional, TYPE_CHECKING, Any
+from typing import Dict, List, Optional, Any
 from fastmcp import FastMCP, Context
 
-if TYPE_CHECKING:
-    from ..models import DiagramInput
-
 from ...utils.logging import get_logger
 from ...utils.exceptions import ArchiMateError, ArchiMateValidationError
 from ...utils.json_parser import parse_json_string
@@ -57,50 +55,49 @@ from ..error_handler import build_enhanced_error_response
 from ..export_manager import create_export_directory
 from ..models import DiagramInput
 from ..response_models import DiagramGenerationResponse, GroupsTestResponse, DiagramFiles, DiagramEnhancementRequest
+from ..diagram_engine import create_archimate_diagram_impl, load_diagram_from_file_impl
+from ..main import mcp
 
 
 def _enhance_validation_error(error_msg: str, diagram_data) -> str:
     """Enhance validation error messages with helpful guidance."""
-    enhanced_msg = error_msg
+    message_parts = [error_msg]
+    error_lower = error_msg.lower()
 
     # Check for common missing field errors
-    enhanced_msg = _add_field_validation_tips(enhanced_msg, error_msg)
+    _add_field_validation_tips(message_parts, error_lower)
 
     # Check for note definition issues
-    enhanced_msg = _add_note_validation_tips(enhanced_msg, error_msg, diagram_data)
+    _add_note_validation_tips(message_parts, error_lower, diagram_data)
 
     # Check for case sensitivity issues
-    enhanced_msg = _add_case_sensitivity_tips(enhanced_msg, error_msg)
+    _add_case_sensitivity_tips(message_parts, error_lower)
 
-    return enhanced_msg
+    return "\n\n".join(message_parts)
 
 
-def _add_field_validation_tips(enhanced_msg: str, error_msg: str) -> str:
+def _add_field_validation_tips(message_parts: list, error_lower: str) -> None:
     """Add tips for common missing field errors."""
-    error_lower = error_msg.lower()
-
     if "id" in error_lower and "required" in error_lower:
-        enhanced_msg += "\n\n💡 TIP: Each element needs a unique 'id' field. Example:\n" \
-                       '{"id": "web_server", "name": "Web Server", "element_type": "Application_Component", "layer": "Application"}'
+        message_parts.append("💡 TIP: Each element needs a unique 'id' field. Example:\n"
+                             '{"id": "web_server", "name": "Web Server", "element_type": "Application_Component", "layer": "Application"}')
 
     if "element_type" in error_lower and "required" in error_lower:
-        enhanced_msg += "\n\n💡 TIP: Elements need an 'element_type' field. Common types:\n" \
-                       "• Business: Business_Actor, Business_Process, Business_Function\n" \
-                       "• Application: Application_Component, Application_Function\n" \
-                       "• Technology: Technology_Node, Technology_SystemSoftware"
+        message_parts.append("💡 TIP: Elements need an 'element_type' field. Common types:\n"
+                             "• Business: Business_Actor, Business_Process, Business_Function\n"
+                             "• Application: Application_Component, Application_Function\n"
+                             "• Technology: Technology_Node, Technology_SystemSoftware")
 
     if "layer" in error_lower and "required" in error_lower:
-        enhanced_msg += "\n\n💡 TIP: Elements need a 'layer' field (case-insensitive). Valid layers:\n" \
-                       "Business, Application, Technology, Physical, Motivation, Strategy, Implementation"
+        message_parts.append("💡 TIP: Elements need a 'layer' field (case-insensitive). Valid layers:\n"
+                             "Business, Application, Technology, Physical, Motivation, Strategy, Implementation")
 
     if "relationship_type" in error_lower and "required" in error_lower:
-        enhanced_msg += "\n\n💡 TIP: Relationships need a 'relationship_type' field (case-insensitive). Common types:\n" \
-                       "Serving, Realization, Access, Composition, Aggregation, Assignment"
-
-    return enhanced_msg
+        message_parts.append("💡 TIP: Relationships need a 'relationship_type' field (case-insensitive). Common types:\n"
+                             "Serving, Realization, Access, Composition, Aggregation, Assignment")
 
 
-def _add_note_validation_tips(enhanced_msg: str, error_msg: str, diagram_data) -> str:
+def _add_note_validation_tips(message_parts: list, error_lower: str, diagram_data) -> None:
     """Add tips for note definition issues."""
     # Handle both dict and DiagramInput objects
     if hasattr(diagram_data, 'elements'):
@@ -108,51 +105,32 @@ def _add_note_validation_tips(enhanced_msg: str, error_msg: str, diagram_data) -
     else:
         elements = diagram_data.get("elements", [])
 
-    if "note" in error_msg.lower() or any(hasattr(elem, 'notes') or (isinstance(elem, dict) and elem.get("notes")) for elem in elements):
+    if "note" in error_lower or any(hasattr(elem, 'notes') or (isinstance(elem, dict) and elem.get("notes")) for elem in elements):
         for elem in elements:
             # Handle both dict and object attributes
             elem_type = getattr(elem, 'element_type', None) or elem.get("element_type") if isinstance(elem, dict) else None
             elem_name = getattr(elem, 'name', '') or elem.get("name", "") if isinstance(elem, dict) else ''
             if elem_type == "Note" or elem_name.lower() == "note":
-                enhanced_msg += "\n\n💡 TIP: Notes should be defined within elements, not as separate elements.\n" \
-                               "Correct way:\n" \
-                               '{"id": "component1", "name": "My Component", "element_type": "Application_Component", "layer": "Application",\n' \
-                               ' "notes": [{"content": "This is a note", "position": "right"}]}\n\n' \
-                               "NOT as separate elements with relationships!"
+                message_parts.append("💡 TIP: Notes should be defined within elements, not as separate elements.\n"
+                                     "Correct way:\n"
+                                     '{"id": "component1", "name": "My Component", "element_type": "Application_Component", "layer": "Application",\n'
+                                     ' "notes": [{"content": "This is a note", "position": "right"}]}\n\n'
+                                     "NOT as separate elements with relationships!")
                 break
-    return enhanced_msg
 
 
-def _add_case_sensitivity_tips(enhanced_msg: str, error_msg: str) -> str:
+def _add_case_sensitivity_tips(message_parts: list, error_lower: str) -> None:
     """Add tips for case sensitivity issues."""
-    error_lower = error_msg.lower()
-
     if "invalid layer" in error_lower:
-        enhanced_msg += "\n\n💡 NOTE: Layer names are now case-insensitive and auto-corrected."
+        message_parts.append("💡 NOTE: Layer names are now case-insensitive and auto-corrected.")
 
     if "invalid relationship type" in error_lower:
-        enhanced_msg += "\n\n💡 NOTE: Relationship types are now case-insensitive and auto-corrected."
-
-    return enhanced_msg
-
-# Make DiagramInput available globally for MCP decorators
-globals()['DiagramInput'] = DiagramInput
+        message_parts.append("💡 NOTE: Relationship types are now case-insensitive and auto-corrected.")
 
 __all__ = ['create_archimate_diagram', 'create_diagram_from_file', 'test_groups_functionality', 'enhance_diagram_with_feedback', 'list_available_resources', 'create_diagram_from_template']
 
-# Import the main MCP instance
-from ..main import mcp
-
 logger = get_logger(__name__)
 
-# Import the implementation functions directly from the diagram engine
-from ..diagram_engine import create_archimate_diagram_impl, load_diagram_from_file_impl
-
-# Ensure DiagramInput is available in global namespace for MCP decorators
-import sys
-current_module = sys.modules[__name__]
-current_module.DiagramInput = DiagramInput
-
 
 @mcp.tool()
 def create_archimate_diagram(diagram: dict) -> DiagramGenerationResponse:
@@ -221,7 +199,7 @@ def create_archimate_diagram(diagram: dict) -> DiagramGenerationResponse:
 
 
 @mcp.tool()
-def create_diagram_from_file(file_path: str) -> DiagramGenerationResponse:
+async def create_diagram_from_file(file_path: str) -> DiagramGenerationResponse:
     """Load ArchiMate diagram from JSON file and generate diagram.
 
     Args:
@@ -231,7 +209,8 @@ def create_diagram_from_file(file_path: str) -> DiagramGenerationResponse:
         Success message with diagram details and file locations.
     """
     try:
-        return load_diagram_from_file_impl(file_path)
+        # File reading and rendering block, so keep them off the event loop
+        return await asyncio.to_thread(load_diagram_from_file_impl, file_path)
     except Exception as e:
         logger.error(f"Error loading diagram from file: {e}")
         return f"❌ Error loading diagram from file:\n\n{str(e)}"
@@ -337,10 +316,6 @@ def test_groups_functionality() -> GroupsTestResponse:
         # Test diagram creation
         result = create_archimate_diagram_impl(diagram_input)
 
-        # Parse result to verify structure
-        import json
-        result_data = json.loads(result)
-
         # Validate that groups functionality worked
         success = result.success
         if not success:
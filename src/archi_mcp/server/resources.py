@@ -485,37 +485,41 @@ def get_diagram_example(example_name: str) -> str:
     return json.dumps(example, indent=2)
 
 
+# The defaults are static, so the resource text is serialized once at import
+_DEFAULT_CONFIGURATION = {
+    "layout": {
+        "direction": "vertical",
+        "show_legend": True,
+        "show_title": True,
+        "group_by_layer": False,
+        "spacing": "normal",
+        "theme": "modern"
+    },
+    "export": {
+        "formats": ["png", "svg", "plantuml"],
+        "png_resolution": "high",
+        "svg_scalable": True
+    },
+    "validation": {
+        "strict_mode": False,
+        "auto_correct_case": True,
+        "validate_relationships": True
+    },
+    "features": {
+        "multi_language": True,
+        "grouping": True,
+        "advanced_styling": True,
+        "custom_relationships": True
+    }
+}
+
+_DEFAULT_CONFIGURATION_JSON = json.dumps({
+    "description": "Default configuration settings for ArchiMate diagram generation",
+    "defaults": _DEFAULT_CONFIGURATION
+}, indent=2)
+
+
 @mcp.resource("archi://config/defaults")
 def get_default_configuration() -> str:
     """Get default configuration settings for diagram generation."""
-    defaults = {
-        "layout": {
-            "direction": "vertical",
-            "show_legend": True,
-            "show_title": True,
-            "group_by_layer": False,
-            "spacing": "normal",
-            "theme": "modern"
-        },
-        "export": {
-            "formats": ["png", "svg", "plantuml"],
-            "png_resolution": "high",
-            "svg_scalable": True
-        },
-        "validation": {
-            "strict_mode": False,
-            "auto_correct_case": True,
-            "validate_relationships": True
-        },
-        "features": {
-            "multi_language": True,
-            "grouping": True,
-            "advanced_styling": True,
-            "custom_relationships": True
-        }
-    }
-
-    return json.dumps({
-        "description": "Default configuration settings for ArchiMate diagram generation",
-        "defaults": defaults
-    }, indent=2)
\ No newline at end of file
+    return _DEFAULT_CONFIGURATION_JSON
\ No newline at end of file
@@ -13,6 +13,7 @@
 
 """Input validation and normalization functions for ArchiMate elements and relationships."""
 
+import sys
 from typing import Tuple, Dict, List
 from ..types import ArchiMateRelationshipType
 from ..archimate import ARCHIMATE_ELEMENTS, ARCHIMATE_RELATIONSHIPS
@@ -157,13 +158,80 @@ VALID_RELATIONSHIPS: List[str] = [
 ]
 
 
+# Short element type names (after layer prefix removal) mapped to canonical types
+_ELEMENT_TYPE_ALIASES: Dict[str, str] = {
+    "Component": "Application_Component",
+    "Service": "Business_Service",  # Default to Business Service
+    "Interface": "Business_Interface",  # Default to Business Interface
+    "Process": "Business_Process",  # Default to Business Process
+    "Function": "Business_Function",  # Default to Business Function
+    "Actor": "Business_Actor",
+    "Role": "Business_Role",
+    "Collaboration": "Business_Collaboration",
+    "Event": "Business_Event",
+    "Object": "Business_Object",
+    "Contract": "Business_Contract",
+    "Representation": "Business_Representation",
+    "Interaction": "Business_Interaction",
+    "Data_Object": "Application_DataObject",
+    "System_Software": "Technology_SystemSoftware",
+    "Artifact": "Technology_Artifact",
+    "Device": "Technology_Device",
+    "Node": "Technology_Node",
+    "Path": "Technology_Path",
+    "Communication_Network": "Technology_CommunicationNetwork",
+    "Stakeholder": "Motivation_Stakeholder",
+    "Driver": "Motivation_Driver",
+    "Assessment": "Motivation_Assessment",
+    "Goal": "Motivation_Goal",
+    "Outcome": "Motivation_Outcome",
+    "Principle": "Motivation_Principle",
+    "Requirement": "Motivation_Requirement",
+    "Constraint": "Motivation_Constraint",
+    "Meaning": "Motivation_Meaning",
+    "Value": "Motivation_Value",
+    "Resource": "Strategy_Resource",
+    "Capability": "Strategy_Capability",
+    "Course_of_Action": "Strategy_CourseOfAction",
+    "Value_Stream": "Strategy_ValueStream",
+    "Work_Package": "Implementation_WorkPackage",
+    "Deliverable": "Implementation_Deliverable",
+    "Plateau": "Implementation_Plateau",
+    "Gap": "Implementation_Gap",
+    "Equipment": "Physical_Equipment",
+    "Facility": "Physical_Facility",
+    "Distribution_Network": "Physical_DistributionNetwork",
+    "Material": "Physical_Material",
+    "Location": "Business_Location"
+}
+
+_ELEMENT_TYPE_PREFIXES = ("Business_", "Application_", "Technology_", "Physical_", "Motivation_", "Strategy_", "Implementation_")
+
+# Intern canonical names so repeated dict/set probes on them compare by identity
+ELEMENT_TYPE_MAPPING = {k: sys.intern(v) for k, v in ELEMENT_TYPE_MAPPING.items()}
+VALID_LAYERS = {k: sys.intern(v) for k, v in VALID_LAYERS.items()}
+VALID_RELATIONSHIPS = [sys.intern(r) for r in VALID_RELATIONSHIPS]
+_ELEMENT_TYPE_ALIASES = {k: sys.intern(v) for k, v in _ELEMENT_TYPE_ALIASES.items()}
+
+# Case-insensitive lookup tables, built once at import time
+_ELEMENT_TYPE_ALIASES_LOWER: Dict[str, str] = {k.lower(): v for k, v in _ELEMENT_TYPE_ALIASES.items()}
+_VALID_LAYERS_LOWER: Dict[str, str] = {k.lower(): v for k, v in VALID_LAYERS.items()}
+_VALID_RELATIONSHIPS_LOWER: Dict[str, str] = {r.lower(): r for r in VALID_RELATIONSHIPS}
+
+
+# Validation tables and error hints, built once at import time
+_VALID_LAYER_NAMES: Tuple[str, ...] = ("Business", "Application", "Technology", "Physical", "Motivation", "Strategy", "Implementation")
+_VALID_LAYER_SET = frozenset(_VALID_LAYER_NAMES)
+_ELEMENT_TYPE_HINT = ", ".join(sorted(ARCHIMATE_ELEMENTS)[:10])
+
+
 def normalize_element_type(element_type: str) -> str:
     """Normalize element type to canonical ArchiMate format."""
     # Handle common variations and prefixes
     element_type = element_type.strip()
 
     # Remove common prefixes if they exist
-    for prefix in ["Business_", "Application_", "Technology_", "Physical_", "Motivation_", "Strategy_", "Implementation_"]:
+    for prefix in _ELEMENT_TYPE_PREFIXES:
         if element_type.startswith(prefix):
             element_type = element_type[len(prefix):]
             break
@@ -172,112 +240,23 @@ def normalize_element_type(element_type: str) -> str:
     element_type = element_type.replace(" ", "_").replace("-", "_")
 
     # Handle special cases
-    type_mapping = {
-        "Component": "Application_Component",
-        "Service": "Business_Service",  # Default to Business Service
-        "Interface": "Business_Interface",  # Default to Business Interface
-        "Process": "Business_Process",  # Default to Business Process
-        "Function": "Business_Function",  # Default to Business Function
-        "Actor": "Business_Actor",
-        "Role": "Business_Role",
-        "Collaboration": "Business_Collaboration",
-        "Event": "Business_Event",
-        "Object": "Business_Object",
-        "Contract": "Business_Contract",
-        "Representation": "Business_Representation",
-        "Interaction": "Business_Interaction",
-        "Data_Object": "Application_DataObject",
-        "System_Software": "Technology_SystemSoftware",
-        "Artifact": "Technology_Artifact",
-        "Device": "Technology_Device",
-        "Node": "Technology_Node",
-        "Path": "Technology_Path",
-        "Communication_Network": "Technology_CommunicationNetwork",
-        "Stakeholder": "Motivation_Stakeholder",
-        "Driver": "Motivation_Driver",
-        "Assessment": "Motivation_Assessment",
-        "Goal": "Motivation_Goal",
-        "Outcome": "Motivation_Outcome",
-        "Principle": "Motivation_Principle",
-        "Requirement": "Motivation_Requirement",
-        "Constraint": "Motivation_Constraint",
-        "Meaning": "Motivation_Meaning",
-        "Value": "Motivation_Value",
-        "Resource": "Strategy_Resource",
-        "Capability": "Strategy_Capability",
-        "Course_of_Action": "Strategy_CourseOfAction",
-        "Value_Stream": "Strategy_ValueStream",
-        "Work_Package": "Implementation_WorkPackage",
-        "Deliverable": "Implementation_Deliverable",
-        "Plateau": "Implementation_Plateau",
-        "Gap": "Implementation_Gap",
-        "Equipment": "Physical_Equipment",
-        "Facility": "Physical_Facility",
-        "Distribution_Network": "Physical_DistributionNetwork",
-        "Material": "Physical_Material",
-        "Location": "Business_Location"
-    }
-
-    return type_mapping.get(element_type, element_type)
+    if element_type in _ELEMENT_TYPE_ALIASES:
+        return _ELEMENT_TYPE_ALIASES[element_type]
+    return sys.intern(_ELEMENT_TYPE_ALIASES_LOWER.get(element_type.lower(), element_type))
 
 
 def normalize_layer(layer: str) -> str:
     """Normalize layer name to canonical ArchiMate format."""
-    layer = layer.strip().title()
-
-    # Handle common variations
-    layer_mapping = {
-        "Business": "Business",
-        "Application": "Application",
-        "Technology": "Technology",
-        "Physical": "Physical",
-        "Motivation": "Motivation",
-        "Strategy": "Strategy",
-        "Implementation": "Implementation",
-        # Handle lowercase variations
-        "business": "Business",
-        "application": "Application",
-        "technology": "Technology",
-        "physical": "Physical",
-        "motivation": "Motivation",
-        "strategy": "Strategy",
-        "implementation": "Implementation"
-    }
-
-    return layer_mapping.get(layer, layer)
+    layer = layer.strip()
+    if layer in VALID_LAYERS:
+        return VALID_LAYERS[layer]
+    return sys.intern(_VALID_LAYERS_LOWER.get(layer.lower(), layer.title()))
 
 
 def normalize_relationship_type(rel_type: str) -> str:
     """Normalize relationship type to canonical ArchiMate format."""
     rel_type = rel_type.strip()
-
-    # Handle common variations
-    type_mapping = {
-        "serving": "Serving",
-        "Serving": "Serving",
-        "realization": "Realization",
-        "Realization": "Realization",
-        "assignment": "Assignment",
-        "Assignment": "Assignment",
-        "access": "Access",
-        "Access": "Access",
-        "influence": "Influence",
-        "Influence": "Influence",
-        "triggering": "Triggering",
-        "Triggering": "Triggering",
-        "flow": "Flow",
-        "Flow": "Flow",
-        "specialization": "Specialization",
-        "Specialization": "Specialization",
-        "aggregation": "Aggregation",
-        "Aggregation": "Aggregation",
-        "composition": "Composition",
-        "Composition": "Composition",
-        "association": "Association",
-        "Association": "Association"
-    }
-
-    return type_mapping.get(rel_type, rel_type)
+    return sys.intern(_VALID_RELATIONSHIPS_LOWER.get(rel_type.lower(), rel_type))
 
 
 def validate_element_input(element: ElementInput) -> Tuple[bool, str]:
@@ -298,7 +277,7 @@ def _validate_element_type(element_type: str) -> None:
     """Validate element type exists in ArchiMate specification."""
     normalized_type = normalize_element_type(element_type)
     if normalized_type not in ARCHIMATE_ELEMENTS:
-        raise ValueError(f"Unknown element type '{element_type}'. Valid types include: {', '.join(sorted(ARCHIMATE_ELEMENTS.keys())[:10])}...")
+        raise ValueError(f"Unknown element type '{element_type}'. Valid types include: {_ELEMENT_TYPE_HINT}...")
 
 
 def _validate_element_required_fields(element_id: str, element_name: str) -> None:
@@ -312,9 +291,8 @@ def _validate_element_required_fields(element_id: str, element_name: str) -> Non
 
 def _validate_element_layer(layer: str) -> None:
     """Validate element layer."""
-    valid_layers = ["Business", "Application", "Technology", "Physical", "Motivation", "Strategy", "Implementation"]
-    if layer not in valid_layers:
-        raise ValueError(f"Invalid layer '{layer}'. Valid layers: {', '.join(valid_layers)}")
+    if layer not in _VALID_LAYER_SET:
+        raise ValueError(f"Invalid layer '{layer}'. Valid layers: {', '.join(_VALID_LAYER_NAMES)}")
 
 
 def validate_relationship_input(rel: RelationshipInput, language: str = "en") -> Tuple[bool, str]:
@@ -13,7 +13,8 @@
 
 """Text extraction utilities for diagram content."""
 
-from typing import List
+from itertools import chain
+from typing import Iterator, List
 
 
 class TextExtractor:
@@ -29,43 +30,46 @@ class TextExtractor:
         Returns:
             List of text content strings
         """
-        all_text = []
+        return list(TextExtractor.iter_text_content(diagram))
 
-        all_text.extend(TextExtractor._extract_text_from_elements(diagram.elements))
-        all_text.extend(TextExtractor._extract_text_from_relationships(diagram.relationships))
-        all_text.extend(TextExtractor._extract_text_from_diagram_metadata(diagram))
+    @staticmethod
+    def iter_text_content(diagram) -> Iterator[str]:
+        """Lazily yield lowercased text content in the same order as collect_text_content.
 
-        return all_text
+        Args:
+            diagram: DiagramInput with elements and relationships
 
+        Returns:
+            Iterator over text content strings
+        """
+        return chain(
+            TextExtractor._extract_text_from_elements(diagram.elements),
+            TextExtractor._extract_text_from_relationships(diagram.relationships),
+            TextExtractor._extract_text_from_diagram_metadata(diagram),
+        )
 
     @staticmethod
-    def _extract_text_from_elements(elements) -> List[str]:
+    def _extract_text_from_elements(elements) -> Iterator[str]:
         """Extract text content from diagram elements."""
-        text_content = []
         for element in elements:
             if element.name:
-                text_content.append(element.name.lower())
+                yield element.name.lower()
             if element.description:
-                text_content.append(element.description.lower())
-        return text_content
+                yield element.description.lower()
 
     @staticmethod
-    def _extract_text_from_relationships(relationships) -> List[str]:
+    def _extract_text_from_relationships(relationships) -> Iterator[str]:
         """Extract text content from diagram relationships."""
-        text_content = []
         for rel in relationships:
             if rel.label:
-                text_content.append(rel.label.lower())
+                yield rel.label.lower()
             if rel.description:
-                text_content.append(rel.description.lower())
-        return text_content
+                yield rel.description.lower()
 
     @staticmethod
-    def _extract_text_from_diagram_metadata(diagram) -> List[str]:
+    def _extract_text_from_diagram_metadata(diagram) -> Iterator[str]:
         """Extract text content from diagram title and description."""
-        text_content = []
         if diagram.title:
-            text_content.append(diagram.title.lower())
+            yield diagram.title.lower()
         if diagram.description:
-            text_content.append(diagram.description.lower())
-        return text_content
\ No newline at end of file
+            yield diagram.description.lower()
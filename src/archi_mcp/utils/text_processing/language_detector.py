@@ -29,6 +29,12 @@ _SLOVAK_INDICATORS: Set[str] = {
     'ň', 'ť', 'ž', 'č', 'š', 'ľ', 'ý', 'á', 'í', 'é', 'ó', 'ú', 'ô'
 }
 
+# Indicators that can occur in pure-ASCII text; all others contain diacritics
+_ASCII_SLOVAK_INDICATORS = frozenset(indicator for indicator in _SLOVAK_INDICATORS if indicator.isascii())
+
+# Maximum amount of text sampled for detection; indicators show up well before this
+_MAX_SAMPLE_CHARS = 4096
+
 # Threshold for Slovak detection - minimum Slovak indicators to trigger Slovak
 _SLOVAK_THRESHOLD = 3
 
@@ -46,12 +52,38 @@ class LanguageDetector:
         Returns:
             Language code (e.g., "sk", "en")
         """
-        all_text = TextExtractor.collect_text_content(diagram)
-        content = ' '.join(all_text)
+        sample = []
+        sample_length = 0
+        for text in TextExtractor.iter_text_content(diagram):
+            sample.append(text)
+            sample_length += len(text)
+            if sample_length >= _MAX_SAMPLE_CHARS:
+                break
+        content = ' '.join(sample)
+
+        return "sk" if LanguageDetector._is_slovak(content) else "en"
+
+    @staticmethod
+    def _is_slovak(content: str) -> bool:
+        """Check whether the content reaches the Slovak indicator threshold.
 
-        slovak_score = LanguageDetector._count_slovak_indicators(content)
+        ASCII-only content is checked against the ASCII indicators alone,
+        and the scan stops as soon as the threshold is reached.
 
-        return "sk" if slovak_score >= _SLOVAK_THRESHOLD else "en"
+        Args:
+            content: Text content to analyze
+
+        Returns:
+            True if at least the threshold number of indicators is found
+        """
+        indicators = _ASCII_SLOVAK_INDICATORS if content.isascii() else _SLOVAK_INDICATORS
+        score = 0
+        for indicator in indicators:
+            if indicator in content:
+                score += 1
+                if score >= _SLOVAK_THRESHOLD:
+                    return True
+        return False
 
     @staticmethod
     def _count_slovak_indicators(content: str) -> int:
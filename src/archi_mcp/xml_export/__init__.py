@@ -22,9 +22,7 @@ This module is designed to be:
 - Standards-compliant with Open Group ArchiMate Exchange specification
 """
 
-from .exporter import ArchiMateXMLExporter
-from .validator import ArchiMateXMLValidator
-from .templates import XMLTemplates
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "Mgr. Patrik Skovajsa, Claude Code Assistant"
@@ -33,4 +31,21 @@ __all__ = [
     "ArchiMateXMLExporter",
     "ArchiMateXMLValidator", 
     "XMLTemplates"
-]
\ No newline at end of file
+]
+
+# Exported names are imported on first access so that importing the package
+# does not load lxml until the XML export is actually used
+_LAZY_EXPORTS = {
+    "ArchiMateXMLExporter": ".exporter",
+    "ArchiMateXMLValidator": ".validator",
+    "XMLTemplates": ".templates",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
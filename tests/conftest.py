@@ -25,6 +25,24 @@ from archi_mcp.archimate.relationships.types import ArchiMateRelationshipType
 from archi_mcp.archimate.generator import ArchiMateGenerator
 from archi_mcp.archimate.validator import ArchiMateValidator
 from archi_mcp.server.main import mcp
+from archi_mcp.server.config import clear_config_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_config():
+    """Re-read environment settings in every test."""
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+@pytest.fixture(autouse=True)
+def no_render_cache(monkeypatch):
+    """Keep tests out of the user's render cache in ~/.cache/archi-mcp.
+
+    Render cache tests re-enable it against a temporary home directory.
+    """
+    monkeypatch.setenv("ARCHI_MCP_RENDER_CACHE", "false")
 
 
 @pytest.fixture
@@ -238,12 +256,20 @@ def complete_layered_architecture(layered_architecture_elements, layered_archite
     return generator
 
 
+# Structural markers of generated PlantUML, in the order they appear
+_PLANTUML_MARKERS = ("@startuml", "!include <archimate/Archimate>", "@enduml")
+
+
 # Utility functions for tests
 def assert_plantuml_valid(plantuml_code: str):
     """Assert that PlantUML code has basic valid structure."""
-    assert "@startuml" in plantuml_code
-    assert "@enduml" in plantuml_code
-    assert "!include <archimate/Archimate>" in plantuml_code
+    position = 0
+    for marker in _PLANTUML_MARKERS:
+        position = plantuml_code.find(marker, position)
+        if position == -1:
+            # pytest.fail still fires when assertions are stripped with -O
+            pytest.fail(f"PlantUML code is missing {marker}")
+        position += len(marker)
 
 
 def assert_element_in_plantuml(plantuml_code: str, element: ArchiMateElement):
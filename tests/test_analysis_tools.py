@@ -152,4 +152,28 @@ class TestTranslationOverrides:
         translate_relationship_labels(diagram, translator)
         
         # For English, labels should remain unchanged
-        assert diagram.relationships[0].label == original_label
\ No newline at end of file
+        assert diagram.relationships[0].label == original_label
+
+    def test_override_only_fills_missing_labels(self):
+        """Test that only relationships without a label receive the translated type."""
+        from archi_mcp.server import DiagramInput, RelationshipInput, translate_relationship_labels
+        from archi_mcp.i18n import ArchiMateTranslator
+
+        diagram = DiagramInput(
+            elements=[
+                {"id": "elem1", "name": "Element 1", "layer": "Business", "element_type": "Actor"},
+                {"id": "elem2", "name": "Element 2", "layer": "Business", "element_type": "Service"}
+            ],
+            relationships=[
+                RelationshipInput(id="rel1", from_element="elem1", to_element="elem2",
+                                  relationship_type="Serving", label="custom"),
+                RelationshipInput(id="rel2", from_element="elem1", to_element="elem2",
+                                  relationship_type="Serving"),
+            ]
+        )
+        translator = ArchiMateTranslator("sk")
+
+        translate_relationship_labels(diagram, translator)
+
+        assert diagram.relationships[0].label == "custom"
+        assert diagram.relationships[1].label == translator.translate_relationship("Serving")
@@ -0,0 +1,49 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18 11:23
+# Last Updated: 2025-12-18 11:23
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""Tests for the background debug artifact writer."""
+
+from archi_mcp.server.artifact_writer import ArtifactWriter
+
+
+class TestArtifactWriter:
+    """Test running write jobs on the background thread."""
+
+    def test_jobs_run_in_order(self, tmp_path):
+        """Test that queued jobs have all run, in order, after a flush."""
+        writer = ArtifactWriter()
+        log = tmp_path / "log.txt"
+
+        def append(text):
+            with open(log, 'a', encoding='utf-8') as f:
+                f.write(text)
+
+        for text in ("a", "b", "c"):
+            writer.submit(append, text)
+        writer.flush()
+
+        assert log.read_text(encoding='utf-8') == "abc"
+
+    def test_failing_job_does_not_stop_writer(self):
+        """Test that jobs after a failing one still run."""
+        writer = ArtifactWriter()
+        results = []
+
+        def fail():
+            raise OSError("disk full")
+
+        writer.submit(fail)
+        writer.submit(results.append, "written")
+        writer.flush()
+
+        assert results == ["written"]
@@ -0,0 +1,51 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18 11:23
+# Last Updated: 2025-12-18 11:23
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""Tests for saving debug artifacts."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from archi_mcp.server import debug_utils
+from archi_mcp.server.debug_utils import save_debug_log
+
+
+class TestSaveDebugLog:
+    """Test writing the debug log to the export directory."""
+
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_save_debug_log(self, tmp_path, orjson_available):
+        """Test that the debug log is written as UTF-8 JSON with either encoder."""
+        if orjson_available and not debug_utils.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+
+        with patch.object(debug_utils, 'ORJSON_AVAILABLE', orjson_available):
+            path = save_debug_log(tmp_path, ["Started", "Processed 2 elements – ok", tmp_path])
+
+        assert json.loads(path.read_text(encoding='utf-8')) == [
+            "Started", "Processed 2 elements – ok", str(tmp_path)
+        ]
+
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_non_string_keys(self, tmp_path, orjson_available):
+        """Test that dictionaries with non-string keys serialize with either encoder."""
+        if orjson_available and not debug_utils.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+
+        with patch.object(debug_utils, 'ORJSON_AVAILABLE', orjson_available):
+            path = save_debug_log(tmp_path, [{1: "first"}])
+
+        assert json.loads(path.read_text(encoding='utf-8')) == [{"1": "first"}]
+
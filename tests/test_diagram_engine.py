@@ -0,0 +1,379 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18 11:23
+# Last Updated: 2025-12-18 11:23
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""Tests for the diagram processing engine helpers."""
+
+import errno
+import json
+import threading
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from archi_mcp.archimate import ArchiMateGenerator
+from archi_mcp.archimate.elements.base import ArchiMateAspect, ArchiMateLayer
+from archi_mcp.server.artifact_writer import flush_artifact_writes
+from archi_mcp.server.config import clear_config_cache
+from archi_mcp.server.diagram_engine import (
+    _generate_and_validate_plantuml,
+    _generate_images,
+    _generate_images_via_pipe,
+    _generate_success_response,
+    _handle_svg_generation,
+    _move_file,
+    _process_elements,
+    _process_generated_images,
+    create_archimate_diagram_impl,
+    load_diagram_from_file_impl,
+)
+from archi_mcp.server.models import DiagramInput
+from archi_mcp.server.plantuml_validator import PNG_IHDR_PREFIX, PNG_SIGNATURE
+from archi_mcp.utils.exceptions import ArchiMateError
+
+
+def _diagram(*elements):
+    return DiagramInput.model_validate({"elements": list(elements), "relationships": []})
+
+
+class TestProcessElements:
+    """Test conversion of element inputs into generator elements."""
+
+    def test_aspect_inferred_from_element_type(self):
+        """Test that a missing aspect is derived from the element type."""
+        generator = ArchiMateGenerator()
+        diagram = _diagram(
+            {"id": "actor", "name": "Customer", "element_type": "Business_Actor", "layer": "Business"},
+            {"id": "data", "name": "Order", "element_type": "Business_Object", "layer": "Business"},
+            {"id": "proc", "name": "Ordering", "element_type": "Business_Process", "layer": "Business"},
+        )
+
+        _process_elements(generator, diagram, "en", [])
+
+        assert generator.elements["actor"].aspect == ArchiMateAspect.ACTIVE_STRUCTURE
+        assert generator.elements["data"].aspect == ArchiMateAspect.PASSIVE_STRUCTURE
+        assert generator.elements["proc"].aspect == ArchiMateAspect.BEHAVIOR
+
+    def test_layer_taken_from_input(self):
+        """Test that the input layer value is mapped to the layer enum."""
+        generator = ArchiMateGenerator()
+        diagram = _diagram(
+            {"id": "app", "name": "CRM", "element_type": "Application_Component", "layer": "application"},
+            {"id": "srv", "name": "Server", "element_type": "Node", "layer": "Technology"},
+        )
+
+        _process_elements(generator, diagram, "en", [])
+
+        assert generator.elements["app"].layer == ArchiMateLayer.APPLICATION
+        assert generator.elements["srv"].layer == ArchiMateLayer.TECHNOLOGY
+
+    def test_explicit_aspect_is_kept(self):
+        """Test that an aspect given in the input takes precedence."""
+        generator = ArchiMateGenerator()
+        diagram = _diagram(
+            {"id": "svc", "name": "Billing", "element_type": "Business_Service",
+             "layer": "Business", "aspect": "Passive Structure"},
+        )
+
+        _process_elements(generator, diagram, "en", [])
+
+        assert generator.elements["svc"].aspect == ArchiMateAspect.PASSIVE_STRUCTURE
+
+    def test_per_element_debug_lines_follow_log_level(self, monkeypatch):
+        """Test that per-element trace lines are only recorded at DEBUG level."""
+        element = {"id": "actor", "name": "Customer", "element_type": "Business_Actor", "layer": "Business"}
+
+        monkeypatch.setenv("ARCHI_MCP_LOG_LEVEL", "INFO")
+        debug_log = []
+        _process_elements(ArchiMateGenerator(), _diagram(element), "en", debug_log)
+        assert debug_log == ["Processing 1 elements"]
+
+        monkeypatch.setenv("ARCHI_MCP_LOG_LEVEL", "DEBUG")
+        clear_config_cache()
+        debug_log = []
+        _process_elements(ArchiMateGenerator(), _diagram(element), "en", debug_log)
+        assert "Added element: actor (Business_Actor)" in debug_log
+
+
+class TestGenerateAndValidatePlantUML:
+    """Test PlantUML generation ahead of rendering."""
+
+    @patch('subprocess.Popen')
+    def test_no_separate_validation_render(self, mock_popen):
+        """Test that generated code is checked without starting PlantUML."""
+        generator = ArchiMateGenerator()
+        _process_elements(generator, _diagram(
+            {"id": "actor", "name": "Customer", "element_type": "Business_Actor", "layer": "Business"},
+        ), "en", [])
+
+        plantuml_code = _generate_and_validate_plantuml(generator, "Title", "", [])
+
+        assert plantuml_code.startswith("@startuml")
+        mock_popen.assert_not_called()
+
+    def test_structure_error_raises(self):
+        """Test that code without diagram delimiters is rejected."""
+        generator = Mock()
+        generator.generate_plantuml.return_value = "actor A"
+
+        with pytest.raises(ArchiMateError, match="missing @startuml and @enduml"):
+            _generate_and_validate_plantuml(generator, "Title", "", [])
+
+
+class TestGenerateImages:
+    """Test PNG/SVG generation process handling."""
+
+    @patch('archi_mcp.server.diagram_engine.setup_java_environment', return_value='java')
+    @patch('subprocess.Popen')
+    def test_svg_process_killed_when_png_fails(self, mock_popen, _mock_setup):
+        """Test that a failed PNG render does not wait on the SVG render."""
+        png_process = Mock(returncode=1)
+        png_process.communicate.return_value = ("", "Syntax error")
+        svg_process = Mock()
+        mock_popen.side_effect = [png_process, svg_process]
+
+        with pytest.raises(ArchiMateError):
+            _generate_images("@startuml\nA\n@enduml", "plantuml.jar", [])
+
+        svg_process.kill.assert_called_once()
+        svg_process.communicate.assert_not_called()
+
+    @patch('archi_mcp.server.diagram_engine.setup_java_environment', return_value='java')
+    @patch('archi_mcp.server.diagram_engine.CAIROSVG_AVAILABLE', True)
+    @patch('subprocess.Popen')
+    @patch('subprocess.run')
+    def test_svg_rasterization_falls_back_to_plantuml_png(self, mock_run, mock_popen, _mock_setup):
+        """Test that a failed SVG-only render falls back to per-format PlantUML runs."""
+        mock_run.return_value = Mock(returncode=1)
+        png_process = Mock(returncode=1)
+        png_process.communicate.return_value = ("", "Syntax error")
+        mock_popen.side_effect = [png_process, Mock()]
+
+        with pytest.raises(ArchiMateError, match="Failed to generate PNG"):
+            _generate_images("@startuml\nB\n@enduml", "plantuml.jar", [])
+
+        assert '-tsvg' in mock_run.call_args[0][0]
+        assert mock_popen.call_count == 2
+
+    @patch('archi_mcp.server.diagram_engine.setup_java_environment', return_value='java')
+    @patch('archi_mcp.server.diagram_engine.CAIROSVG_AVAILABLE', False)
+    @patch('subprocess.Popen')
+    def test_failed_render_leaves_no_files_in_work_dir(self, mock_popen, _mock_setup, tmp_path):
+        """Test that the source and any partial images are removed when rendering fails."""
+        def render(cmd, **kwargs):
+            Path(cmd[-1]).with_suffix('.' + cmd[-2][2:]).write_bytes(b"partial")
+            return Mock(returncode=1, communicate=Mock(return_value=("", "Syntax error")))
+        mock_popen.side_effect = render
+
+        with pytest.raises(ArchiMateError):
+            _generate_images("@startuml\nD\n@enduml", "plantuml.jar", [], tmp_path)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_rejected_svg_is_deleted(self, tmp_path):
+        """Test that an SVG from a failed run is removed rather than left behind."""
+        svg_file = tmp_path / "render.svg"
+        svg_file.write_text("partial")
+
+        assert _handle_svg_generation(Mock(returncode=1), str(svg_file), []) is None
+        assert not svg_file.exists()
+
+    @patch('archi_mcp.server.diagram_engine.find_plantuml_jar', return_value="plantuml.jar")
+    @patch('archi_mcp.server.diagram_engine._generate_images', side_effect=ArchiMateError("render failed"))
+    def test_export_directory_removed_when_rendering_fails(self, _mock_generate, _mock_find_jar, tmp_path):
+        """Test that a failed render does not leave an empty export directory."""
+        export_dir = tmp_path / "20251218_112300"
+        export_dir.mkdir()
+
+        with patch('archi_mcp.server.diagram_engine.create_export_directory', return_value=export_dir):
+            with pytest.raises(ArchiMateError):
+                _process_generated_images("@startuml\nE\n@enduml", Mock(), "Title", 0.0, [])
+
+        assert not export_dir.exists()
+
+    @patch('archi_mcp.server.diagram_engine.setup_java_environment', return_value='java')
+    @patch('archi_mcp.server.diagram_engine.CAIROSVG_AVAILABLE', False)
+    @patch('subprocess.Popen')
+    def test_evicted_cache_entry_renders_again(self, mock_popen, _mock_setup, tmp_path):
+        """Test that a cache entry removed after the lookup falls back to rendering."""
+        def render(cmd, **kwargs):
+            output = Path(cmd[-1]).with_suffix('.' + cmd[-2][2:])
+            output.write_bytes(PNG_SIGNATURE + PNG_IHDR_PREFIX + bytes(100) if output.suffix == '.png' else b"<svg></svg>")
+            return Mock(returncode=0, communicate=Mock(return_value=("", "")))
+        mock_popen.side_effect = render
+        evicted = (tmp_path / "gone.png", tmp_path / "gone.svg")
+        work_dir = tmp_path / "export"
+        work_dir.mkdir()
+
+        with patch('archi_mcp.server.diagram_engine.get_cached_render', return_value=evicted):
+            png_path, svg_path = _generate_images("@startuml\nF\n@enduml", "plantuml.jar", [], work_dir)
+
+        assert mock_popen.call_count == 2
+        assert sorted(work_dir.iterdir()) == sorted([Path(png_path), Path(svg_path)])
+
+    def test_images_created_in_work_dir(self, tmp_path):
+        """Test that intermediate images are created in the given work directory."""
+        cached_png = tmp_path / "cached.png"
+        cached_svg = tmp_path / "cached.svg"
+        cached_png.write_bytes(b"png-data")
+        cached_svg.write_text("<svg/>")
+        work_dir = tmp_path / "export"
+        work_dir.mkdir()
+
+        with patch('archi_mcp.server.diagram_engine.get_cached_render', return_value=(cached_png, cached_svg)):
+            png_path, svg_path = _generate_images("@startuml\nC\n@enduml", "plantuml.jar", [], work_dir)
+
+        assert Path(png_path).parent == work_dir
+        assert Path(svg_path).parent == work_dir
+        assert Path(png_path).read_bytes() == b"png-data"
+
+
+class TestPipeRenderErrors:
+    """Test that PlantUML errors from the pipes are not reported as success."""
+
+    @patch('archi_mcp.server.diagram_engine.store_render')
+    @patch('archi_mcp.server.diagram_engine.get_cached_render', return_value=None)
+    @patch('archi_mcp.server.diagram_engine.setup_java_environment', return_value='java')
+    @patch('subprocess.Popen')
+    def test_pipe_error_falls_back_to_one_shot(self, mock_popen, _mock_setup, _mock_cache, mock_store, monkeypatch):
+        """Test that a pipe error is re-rendered one-shot, raised, and not cached."""
+        from archi_mcp.server.plantuml_pipe import PlantUMLPipeError
+
+        monkeypatch.setenv("ARCHI_MCP_PLANTUML_PIPE", "true")
+        failing_pipe = Mock(render=Mock(side_effect=PlantUMLPipeError("Error line 2: Syntax Error?", 2)))
+        png_process = Mock(returncode=200)
+        png_process.communicate.return_value = ("", "Error line 2 in file: diagram.puml")
+        mock_popen.side_effect = [png_process, Mock()]
+
+        with patch('archi_mcp.server.diagram_engine.get_plantuml_pipe', return_value=failing_pipe), \
+                patch('archi_mcp.server.diagram_engine.CAIROSVG_AVAILABLE', False):
+            with pytest.raises(ArchiMateError, match="Error line 2"):
+                _generate_images("@startuml\nA -\n@enduml", "plantuml.jar", [])
+
+        assert mock_popen.call_count == 2
+        mock_store.assert_not_called()
+
+
+class TestGenerateImagesViaPipe:
+    """Test rendering through the persistent PlantUML pipes."""
+
+    def test_png_failure_does_not_wait_for_svg(self):
+        """Test that a failed PNG render returns while the SVG render is still running."""
+        release_svg = threading.Event()
+        pipes = {
+            'png': Mock(render=Mock(side_effect=RuntimeError("png failed"))),
+            'svg': Mock(render=Mock(side_effect=lambda code: release_svg.wait(5))),
+        }
+
+        with patch('archi_mcp.server.diagram_engine.get_plantuml_pipe',
+                   side_effect=lambda java, jar, fmt: pipes[fmt]) as get_pipe:
+            try:
+                with pytest.raises(RuntimeError, match="png failed"):
+                    _generate_images_via_pipe("@startuml\nA\n@enduml", "/opt/jdk/bin/java", "plantuml.jar", [])
+                assert not release_svg.is_set()
+            finally:
+                release_svg.set()
+
+        assert {call.args[0] for call in get_pipe.call_args_list} == {"/opt/jdk/bin/java"}
+
+
+class TestMoveFile:
+    """Test moving rendered images into the export directory."""
+
+    def test_move_renames(self, tmp_path):
+        """Test that a file is moved within a filesystem."""
+        src = tmp_path / "render.png"
+        src.write_bytes(b"png-data")
+
+        _move_file(str(src), tmp_path / "diagram.png")
+
+        assert not src.exists()
+        assert (tmp_path / "diagram.png").read_bytes() == b"png-data"
+
+    def test_move_copies_across_filesystems(self, tmp_path):
+        """Test that a cross-device rename falls back to copy and delete."""
+        src = tmp_path / "render.png"
+        src.write_bytes(b"png-data")
+
+        with patch('os.replace', side_effect=OSError(errno.EXDEV, "Invalid cross-device link")):
+            _move_file(str(src), tmp_path / "diagram.png")
+
+        assert not src.exists()
+        assert (tmp_path / "diagram.png").read_bytes() == b"png-data"
+
+    def test_other_errors_propagate(self, tmp_path):
+        """Test that rename errors other than EXDEV are raised."""
+        with pytest.raises(FileNotFoundError):
+            _move_file(str(tmp_path / "missing.png"), tmp_path / "diagram.png")
+
+
+class TestSuccessResponse:
+    """Test building the response for a generated diagram."""
+
+    def test_debug_log_returned_only_when_enabled(self, tmp_path, monkeypatch):
+        """Test that the debug log is attached only when ARCHI_MCP_RETURN_DEBUG_LOG is set."""
+        args = (tmp_path, False, "diagram.puml", "diagram.png", None, ["Started"])
+
+        assert _generate_success_response(*args).debug_log is None
+
+        monkeypatch.setenv("ARCHI_MCP_RETURN_DEBUG_LOG", "true")
+        clear_config_cache()
+        assert _generate_success_response(*args).debug_log == ["Started"]
+
+
+class TestSaveFailedAttempt:
+    """Test persisting artifacts of a failed diagram request."""
+
+    @patch('archi_mcp.server.diagram_engine.find_plantuml_jar', return_value=None)
+    def test_failed_attempt_saved_in_background(self, _mock_find_jar, tmp_path):
+        """Test that a failure is raised first and its artifacts are written by the background writer."""
+        diagram = _diagram({"id": "actor", "name": "Customer", "element_type": "Business_Actor", "layer": "Business"})
+
+        with patch('archi_mcp.server.debug_utils.create_export_directory', return_value=tmp_path):
+            with pytest.raises(ArchiMateError):
+                create_archimate_diagram_impl(diagram)
+            flush_artifact_writes()
+
+        assert (tmp_path / "failed_diagram.puml").read_text(encoding='utf-8').startswith("@startuml")
+        assert json.loads((tmp_path / "failed_input.json").read_text(encoding='utf-8'))["elements"][0]["id"] == "actor"
+        assert (tmp_path / "debug_log.json").exists()
+
+
+class TestLoadDiagramFromFile:
+    """Test parsing diagram files before generation."""
+
+    @pytest.mark.parametrize("content", [
+        '{"elements": [{"id": "a", "name": "A", "element_type": "Business_Actor", "layer": "Business"}], "relationships": []}',
+        "{'elements': [{'id': 'a', 'name': 'A', 'element_type': 'Business_Actor', 'layer': 'Business',},], 'relationships': [],}",
+    ])
+    @patch('archi_mcp.server.diagram_engine.create_archimate_diagram_impl')
+    def test_strict_and_json5_files(self, mock_create, tmp_path, content):
+        """Test that strict JSON and JSON5 files both produce a validated diagram."""
+        json_file = tmp_path / "diagram.json"
+        json_file.write_text(content, encoding='utf-8')
+
+        load_diagram_from_file_impl(str(json_file))
+
+        diagram = mock_create.call_args[0][0]
+        assert [element.id for element in diagram.elements] == ["a"]
+
+    @patch('archi_mcp.server.diagram_engine.create_archimate_diagram_impl')
+    def test_schema_error_is_reported(self, mock_create, tmp_path):
+        """Test that valid JSON failing validation is reported without generation."""
+        json_file = tmp_path / "diagram.json"
+        json_file.write_text('{"elements": "not a list"}', encoding='utf-8')
+
+        result = load_diagram_from_file_impl(str(json_file))
+
+        assert "❌" in result
+        mock_create.assert_not_called()
@@ -0,0 +1,79 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18 11:23
+# Last Updated: 2025-12-18 11:23
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""Tests for export directory management."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from archi_mcp.server import export_manager
+
+
+@pytest.fixture
+def home(tmp_path):
+    """Point the exports directory at a temporary home directory."""
+    export_manager.get_exports_directory.cache_clear()
+    with patch.object(Path, 'home', return_value=tmp_path):
+        yield tmp_path
+    export_manager.get_exports_directory.cache_clear()
+
+
+class TestExportsDirectory:
+    """Test locating and creating export directories."""
+
+    def test_exports_directory_created_once(self, home):
+        """Test that the exports directory is created on first use and then reused."""
+        with patch.object(Path, 'mkdir', autospec=True, side_effect=Path.mkdir) as mkdir:
+            first = export_manager.get_exports_directory()
+            calls_after_first = mkdir.call_count
+            second = export_manager.get_exports_directory()
+
+        assert first == second == home / "Documents" / "archi-mcp-exports"
+        assert first.is_dir()
+        assert mkdir.call_count == calls_after_first
+
+    def test_export_directory_restores_removed_parent(self, home):
+        """Test that a removed exports directory is recreated for a new export."""
+        exports_dir = export_manager.get_exports_directory()
+        exports_dir.rmdir()
+
+        export_dir = export_manager.create_export_directory()
+
+        assert export_dir.parent == exports_dir
+        assert export_dir.is_dir()
+
+
+class TestCleanupFailedExports:
+    """Test moving exports without images out of the way."""
+
+    def test_exports_without_png_moved(self, home):
+        """Test that only export directories lacking a PNG are moved to failed_attempts."""
+        exports_dir = export_manager.get_exports_directory()
+        succeeded = exports_dir / "20250101_000000"
+        succeeded.mkdir()
+        (succeeded / "diagram.puml").write_text("@startuml\n@enduml")
+        (succeeded / "Diagram.PNG").write_bytes(b"png")
+        failed = exports_dir / "20250101_000001"
+        failed.mkdir()
+        (failed / "failed_diagram.puml").write_text("@startuml\n@enduml")
+        (failed / "png").mkdir()
+        (exports_dir / "notes.png").write_bytes(b"png")
+
+        export_manager.cleanup_failed_exports()
+
+        assert succeeded.is_dir()
+        assert not failed.exists()
+        assert (exports_dir / "failed_attempts" / "20250101_000001").is_dir()
+        assert (exports_dir / "notes.png").is_file()
@@ -17,7 +17,9 @@ import pytest
 from pathlib import Path
 import tempfile
 from archi_mcp.archimate.generator import ArchiMateGenerator, DiagramLayout
-from archi_mcp.archimate.elements.base import ArchiMateElement, ArchiMateLayer, ArchiMateAspect, ComponentPort, PortDirection
+from archi_mcp.archimate.elements.base import (
+    ArchiMateElement, ArchiMateLayer, ArchiMateAspect, ArchiMateGroup, ComponentGroupingStyle, ComponentPort, PortDirection
+)
 from archi_mcp.archimate.relationships import ArchiMateRelationship
 from archi_mcp.archimate.relationships.types import ArchiMateRelationshipType
 from archi_mcp.utils.exceptions import ArchiMateGenerationError
@@ -107,6 +109,78 @@ class TestArchiMateGenerator:
         
         assert "validation failed" in str(exc_info.value).lower()
     
+    def test_add_elements_batch(self):
+        """Test adding several elements in one call."""
+        generator = ArchiMateGenerator()
+        elements = [self.create_test_element("1"), self.create_test_element("2")]
+
+        generator.add_elements(elements)
+
+        assert list(generator.elements.values()) == elements
+        assert generator.get_layers_used() == [elements[0].layer.value]
+
+    def test_add_elements_batch_is_atomic(self):
+        """Test that a duplicate ID leaves the batch unadded."""
+        generator = ArchiMateGenerator()
+        elements = [self.create_test_element("1"), self.create_test_element("1")]
+
+        with pytest.raises(ArchiMateGenerationError) as exc_info:
+            generator.add_elements(elements)
+
+        assert exc_info.value.details["element_id"] == elements[0].id
+        assert generator.elements == {}
+
+    def test_add_groups_batch_is_atomic(self):
+        """Test that a duplicate group ID leaves the batch unadded."""
+        generator = ArchiMateGenerator()
+        groups = [
+            ArchiMateGroup(id="g1", name="One", group_type=ComponentGroupingStyle.PACKAGE),
+            ArchiMateGroup(id="g2", name="Two", group_type=ComponentGroupingStyle.NODE),
+        ]
+        generator.add_groups(groups)
+        assert list(generator.groups) == ["g1", "g2"]
+
+        with pytest.raises(ArchiMateGenerationError) as exc_info:
+            generator.add_groups([ArchiMateGroup(id="g3", name="Three", group_type=ComponentGroupingStyle.FRAME),
+                                  ArchiMateGroup(id="g1", name="Again", group_type=ComponentGroupingStyle.FRAME)])
+
+        assert exc_info.value.details["group_id"] == "g1"
+        assert list(generator.groups) == ["g1", "g2"]
+
+    def test_add_relationships_batch(self):
+        """Test adding several relationships in one call."""
+        generator = ArchiMateGenerator()
+        element1 = self.create_test_element("1")
+        element2 = self.create_test_element("2")
+        generator.add_element(element1)
+        generator.add_element(element2)
+
+        relationships = [
+            self.create_test_relationship(element1.id, element2.id, "1"),
+            self.create_test_relationship(element2.id, element1.id, "2"),
+        ]
+        generator.add_relationships(relationships)
+
+        assert generator.relationships == relationships
+
+    def test_add_relationships_batch_is_atomic(self):
+        """Test that an invalid relationship leaves the batch unadded."""
+        generator = ArchiMateGenerator()
+        element1 = self.create_test_element("1")
+        element2 = self.create_test_element("2")
+        generator.add_element(element1)
+        generator.add_element(element2)
+
+        relationships = [
+            self.create_test_relationship(element1.id, element2.id, "1"),
+            self.create_test_relationship(element1.id, "missing", "2"),
+        ]
+        with pytest.raises(ArchiMateGenerationError) as exc_info:
+            generator.add_relationships(relationships)
+
+        assert exc_info.value.details["relationship_id"] == "test_rel_2"
+        assert generator.relationships == []
+
     def test_set_layout(self):
         """Test setting diagram layout."""
         generator = ArchiMateGenerator()
@@ -282,6 +356,9 @@ class TestArchiMateGenerator:
         assert "Business" in layers
         assert "Technology" in layers
         assert len(layers) == 2
+
+        generator.clear()
+        assert generator.get_layers_used() == []
     
     def test_validate_diagram_success(self):
         """Test successful diagram validation."""
@@ -0,0 +1,83 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18 11:23
+# Last Updated: 2025-12-18 11:23
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""Tests for markdown documentation generation."""
+
+from types import SimpleNamespace
+
+from archi_mcp.server.markdown_generator import (
+    generate_architecture_markdown,
+    _analyze_relationships,
+    _collect_markdown_stats,
+    _generate_detailed_description,
+    _most_connected_elements,
+)
+
+
+class TestMarkdownStats:
+    """Test shared statistics collected for markdown sections."""
+
+    def test_collect_markdown_stats(self, generator_with_sample_data):
+        """Test that statistics reflect the generator contents."""
+        generator = generator_with_sample_data
+        stats = _collect_markdown_stats(generator)
+
+        assert stats.element_count == len(generator.elements)
+        assert stats.relationship_count == len(generator.relationships)
+        assert sum(stats.layer_counts.values()) == len(generator.elements)
+        assert set(stats.layer_counts) == set(generator.get_layers_used())
+        assert {layer: len(members) for layer, members in stats.elements_by_layer.items()} == stats.layer_counts
+
+
+    def test_layer_buckets_sorted_by_name(self, generator_with_sample_data):
+        """Test that elements are bucketed per layer in name order."""
+        stats = _collect_markdown_stats(generator_with_sample_data)
+
+        for members in stats.elements_by_layer.values():
+            assert [e.name for e in members] == sorted(e.name for e in members)
+
+
+class TestArchitectureMarkdown:
+    """Test the generated architecture markdown document."""
+
+    def test_generate_architecture_markdown(self, generator_with_sample_data):
+        """Test that all sections are rendered."""
+        markdown = generate_architecture_markdown(
+            generator_with_sample_data, "Sample Architecture", "Sample description"
+        )
+
+        assert markdown.startswith("# Sample Architecture")
+        assert "**Description:** Sample description" in markdown
+        assert "![Sample Architecture](diagram.png)" in markdown
+        assert "| Total Elements | 3 |" in markdown
+        assert "| Total Relationships | 1 |" in markdown
+        assert "### Business Layer" in markdown
+        assert "| Sample Application Component | Realization | Sample Business Service |" in markdown
+        assert "- **Realization**: 1 relationship" in markdown
+        assert "*Generated by ArchiMate MCP Server*" in markdown
+
+    def test_generate_architecture_markdown_empty(self):
+        """Test markdown generation for an empty diagram."""
+        from archi_mcp.archimate.generator import ArchiMateGenerator
+
+        markdown = generate_architecture_markdown(ArchiMateGenerator(), "Empty", "")
+
+        assert "| Total Elements | 0 |" in markdown
+        assert "No specific insights available for this architecture." in markdown
+
+    def test_generate_detailed_description(self, generator_with_sample_data):
+        """Test the detailed architecture description."""
+        description = _generate_detailed_description(generator_with_sample_data, "view")
+
+        assert description.startswith("This view contains 3 elements and 1 relationships")
+        assert "1 business elements" in description
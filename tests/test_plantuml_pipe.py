@@ -0,0 +1,146 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18 11:23
+# Last Updated: 2025-12-18 11:23
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""Tests for the persistent PlantUML pipe renderer."""
+
+import io
+from unittest.mock import Mock, patch
+
+import pytest
+
+from archi_mcp.server.plantuml_pipe import (
+    PIPE_DELIMITER,
+    PlantUMLPipe,
+    PlantUMLPipeError,
+    _check_render_output,
+    _read_until_delimiter,
+    shutdown_plantuml_pipes,
+    warm_up_plantuml_pipes,
+)
+
+
+def _fake_process(stdout_bytes: bytes) -> Mock:
+    process = Mock()
+    process.poll.return_value = None
+    process.stdin = io.BytesIO()
+    process.stdout = io.BytesIO(stdout_bytes)
+    return process
+
+
+class TestReadUntilDelimiter:
+    """Test framing of rendered images on the pipe's stdout."""
+
+    def test_delimiter_directly_after_binary_data(self):
+        """Test that image bytes without a trailing newline are split correctly."""
+        stream = io.BytesIO(b"\x89PNG\r\n\x1a\nbinary\nIEND" + PIPE_DELIMITER + b"\n")
+        assert _read_until_delimiter(stream) == b"\x89PNG\r\n\x1a\nbinary\nIEND"
+
+    def test_closed_stream_raises(self):
+        """Test that a pipe closing mid-render is reported."""
+        with pytest.raises(RuntimeError):
+            _read_until_delimiter(io.BytesIO(b"partial"))
+
+
+class TestCheckRenderOutput:
+    """Test detection of PlantUML errors reported on the pipe's stdout."""
+
+    PNG = b"\x89PNG\r\n\x1a\ndata\x00\x00\x00\x00IEND\xaeB`\x82"
+
+    def test_image_without_error(self):
+        """Test that a clean render is returned unchanged."""
+        assert _check_render_output(self.PNG, "png") == self.PNG
+        assert _check_render_output(b"<svg>ERROR</svg>", "svg") == b"<svg>ERROR</svg>"
+
+    def test_error_after_png(self):
+        """Test that an error block following the error image is raised."""
+        output = self.PNG + b"ERROR\n3\nSyntax Error?\n"
+
+        with pytest.raises(PlantUMLPipeError, match="Syntax Error") as excinfo:
+            _check_render_output(output, "png")
+        assert excinfo.value.line_number == 3
+
+    def test_error_after_svg(self):
+        """Test that an error block following an SVG error image is raised."""
+        with pytest.raises(PlantUMLPipeError):
+            _check_render_output(b"<svg><text>x</text></svg>\nERROR\n1\nbad\n", "svg")
+
+    def test_error_before_image(self):
+        """Test that an error block written ahead of the image is raised."""
+        with pytest.raises(PlantUMLPipeError, match="Error line 2: bad"):
+            _check_render_output(b"ERROR\n2\nbad\n" + self.PNG, "png")
+
+
+class TestPlantUMLPipe:
+    """Test the persistent pipe process wrapper."""
+
+    @patch('subprocess.Popen')
+    def test_render_reuses_process(self, mock_popen):
+        """Test that consecutive renders share one process."""
+        process = _fake_process(b"first" + PIPE_DELIMITER + b"\nsecond" + PIPE_DELIMITER + b"\n")
+        mock_popen.return_value = process
+        pipe = PlantUMLPipe("java", "plantuml.jar", "png")
+
+        assert pipe.render("@startuml\nA\n@enduml") == b"first"
+        assert pipe.render("@startuml\nB\n@enduml") == b"second"
+
+        mock_popen.assert_called_once()
+        command = mock_popen.call_args[0][0]
+        assert "-pipe" in command and "-pipeNoStderr" in command and "-tpng" in command
+        assert process.stdin.getvalue() == b"@startuml\nA\n@enduml\n@startuml\nB\n@enduml\n"
+
+    @patch('subprocess.Popen')
+    def test_failed_render_discards_process(self, mock_popen):
+        """Test that a process is not reused after a failed render."""
+        broken = _fake_process(b"")
+        healthy = _fake_process(b"ok" + PIPE_DELIMITER + b"\n")
+        mock_popen.side_effect = [broken, healthy]
+        pipe = PlantUMLPipe("java", "plantuml.jar", "svg")
+
+        with pytest.raises(RuntimeError):
+            pipe.render("@startuml\nA\n@enduml")
+        broken.kill.assert_called()
+
+        assert pipe.render("@startuml\nA\n@enduml") == b"ok"
+        assert mock_popen.call_count == 2
+
+    @patch('subprocess.Popen')
+    def test_reported_error_keeps_process(self, mock_popen):
+        """Test that a PlantUML error is raised without discarding the process."""
+        process = _fake_process(
+            b"<svg></svg>\nERROR\n1\nSyntax Error?\n" + PIPE_DELIMITER + b"\n<svg></svg>" + PIPE_DELIMITER + b"\n"
+        )
+        mock_popen.return_value = process
+        pipe = PlantUMLPipe("java", "plantuml.jar", "svg")
+
+        with pytest.raises(PlantUMLPipeError):
+            pipe.render("@startuml\nA -> \n@enduml")
+        assert pipe.render("@startuml\nA\n@enduml") == b"<svg></svg>"
+
+        process.kill.assert_not_called()
+        mock_popen.assert_called_once()
+
+    @patch('subprocess.Popen')
+    def test_warm_up_starts_both_formats(self, mock_popen):
+        """Test that warm-up renders once through the PNG and SVG pipes."""
+        mock_popen.side_effect = [
+            _fake_process(b"png" + PIPE_DELIMITER + b"\n"),
+            _fake_process(b"svg" + PIPE_DELIMITER + b"\n"),
+        ]
+
+        try:
+            warm_up_plantuml_pipes("java", "warmup-test.jar")
+        finally:
+            shutdown_plantuml_pipes()
+
+        formats = [call[0][0][6] for call in mock_popen.call_args_list]
+        assert formats == ["-tpng", "-tsvg"]
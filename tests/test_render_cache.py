@@ -0,0 +1,136 @@
+# Copyright (c) 2025 Bivex
+#
+# Author: Bivex
+# Available for contact via email: support@b-b.top
+# For up-to-date contact information:
+# https://github.com/bivex
+#
+# Created: 2025-12-18 11:23
+# Last Updated: 2025-12-18 11:23
+#
+# Licensed under the MIT License.
+# Commercial licensing available upon request.
+
+"""Tests for the rendered image cache."""
+
+from unittest.mock import patch
+
+import pytest
+
+from archi_mcp.server import render_cache
+from archi_mcp.server.render_cache import get_cached_render, render_cache_key, store_render
+
+PLANTUML = "@startuml\nactor A\n@enduml"
+JAR = "plantuml.jar"
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    """Point the cache at a temporary home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("ARCHI_MCP_RENDER_CACHE", "true")
+    monkeypatch.setattr(render_cache, "_cache_size", None)
+    monkeypatch.setattr(render_cache, "_stores_since_scan", 0)
+    return tmp_path
+
+
+class TestRenderCache:
+    """Test storing and looking up rendered images."""
+
+    def test_key_depends_on_source(self):
+        """Test that different sources get different keys."""
+        assert render_cache_key(PLANTUML, JAR) == render_cache_key(PLANTUML, JAR)
+        assert render_cache_key(PLANTUML, JAR) != render_cache_key(PLANTUML + "\n", JAR)
+
+    def test_key_depends_on_jar(self, tmp_path):
+        """Test that a different or upgraded PlantUML JAR gets a different key."""
+        jar = tmp_path / "plantuml.jar"
+        other_jar = tmp_path / "plantuml-new.jar"
+        jar.write_bytes(b"v1")
+        other_jar.write_bytes(b"v1")
+
+        key = render_cache_key(PLANTUML, str(jar))
+        assert key == render_cache_key(PLANTUML, str(jar))
+        assert key != render_cache_key(PLANTUML, str(other_jar))
+
+        jar.write_bytes(b"v2-upgraded")
+        assert key != render_cache_key(PLANTUML, str(jar))
+
+    def test_store_and_lookup(self, cache_home):
+        """Test that stored images are returned on the next lookup."""
+        png = cache_home / "out.png"
+        svg = cache_home / "out.svg"
+        png.write_bytes(b"png-data")
+        svg.write_text("<svg/>")
+
+        assert get_cached_render(PLANTUML, JAR) is None
+        store_render(PLANTUML, JAR, str(png), str(svg))
+
+        cached_png, cached_svg = get_cached_render(PLANTUML, JAR)
+        assert cached_png.read_bytes() == b"png-data"
+        assert cached_svg.read_text() == "<svg/>"
+
+    def test_disabled_cache(self, cache_home, monkeypatch):
+        """Test that nothing is stored or returned when the cache is disabled."""
+        monkeypatch.setenv("ARCHI_MCP_RENDER_CACHE", "false")
+        png = cache_home / "out.png"
+        svg = cache_home / "out.svg"
+        png.write_bytes(b"png-data")
+        svg.write_text("<svg/>")
+
+        store_render(PLANTUML, JAR, str(png), str(svg))
+        assert get_cached_render(PLANTUML, JAR) is None
+
+    def test_eviction_over_size_cap(self, cache_home, monkeypatch):
+        """Test that old entries are evicted once the cap is exceeded."""
+        monkeypatch.setenv("ARCHI_MCP_RENDER_CACHE_MAX_MB", "0")
+        png = cache_home / "out.png"
+        svg = cache_home / "out.svg"
+        png.write_bytes(b"png-data")
+        svg.write_text("<svg/>")
+
+        store_render(PLANTUML, JAR, str(png), str(svg))
+        assert get_cached_render(PLANTUML, JAR) is None
+
+    def test_cache_scanned_only_when_cap_may_be_exceeded(self, cache_home):
+        """Test that the cache directory is scanned once, not on every store."""
+        png = cache_home / "out.png"
+        svg = cache_home / "out.svg"
+        png.write_bytes(b"png-data")
+        svg.write_text("<svg/>")
+
+        with patch.object(render_cache, "_evict_old_entries", wraps=render_cache._evict_old_entries) as evict:
+            for i in range(3):
+                store_render(f"{PLANTUML}\n' {i}", JAR, str(png), str(svg))
+
+        assert evict.call_count == 1
+
+    def test_failed_copy_leaves_no_partial_entry(self, cache_home):
+        """Test that a failed PNG copy leaves no temporary file and no cache hit."""
+        svg = cache_home / "out.svg"
+        svg.write_text("<svg/>")
+
+        store_render(PLANTUML, JAR, str(cache_home / "missing.png"), str(svg))
+
+        entry = render_cache._entry_directory(render_cache_key(PLANTUML, JAR))
+        assert get_cached_render(PLANTUML, JAR) is None
+        assert [path.name for path in entry.iterdir()] == ["diagram.svg"]
+
+    def test_render_without_svg_not_stored(self, cache_home):
+        """Test that a PNG-only render is not cached."""
+        png = cache_home / "out.png"
+        png.write_bytes(b"png-data")
+
+        store_render(PLANTUML, JAR, str(png), None)
+        assert get_cached_render(PLANTUML, JAR) is None
+
+    def test_entry_without_svg_is_a_miss(self, cache_home):
+        """Test that an entry missing its SVG is not served."""
+        png = cache_home / "out.png"
+        svg = cache_home / "out.svg"
+        png.write_bytes(b"png-data")
+        svg.write_text("<svg/>")
+        store_render(PLANTUML, JAR, str(png), str(svg))
+
+        (render_cache._entry_directory(render_cache_key(PLANTUML, JAR)) / "diagram.svg").unlink()
+        assert get_cached_render(PLANTUML, JAR) is None
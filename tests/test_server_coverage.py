@@ -111,6 +111,44 @@ class TestLanguageDetection:
         language = detect_language_from_content(diagram)
         assert language == "sk"
 
+    def test_detect_language_ascii_slovak(self):
+        """Test that Slovak words without diacritics are still detected."""
+        from archi_mcp.server import DiagramInput, ElementInput, detect_language_from_content
+
+        diagram = DiagramInput(
+            title="Platform overview",
+            elements=[
+                ElementInput(
+                    id="test",
+                    name="Podpora proces",
+                    element_type="Business_Process",
+                    layer="Business",
+                    description="objekt"
+                )
+            ],
+            relationships=[]
+        )
+
+        assert detect_language_from_content(diagram) == "sk"
+
+    def test_detect_language_samples_leading_text(self):
+        """Test that detection stops reading content once the sample is full."""
+        from types import SimpleNamespace
+        from archi_mcp.utils.language_detection import LanguageDetector
+
+        def unread_relationships():
+            raise AssertionError("relationships read past the sample limit")
+            yield
+
+        diagram = SimpleNamespace(
+            title=None,
+            description=None,
+            elements=[SimpleNamespace(name="Customer " * 1000, description=None)],
+            relationships=unread_relationships(),
+        )
+
+        assert LanguageDetector.detect_language_from_content(diagram) == "en"
+
 
 class TestCustomRelationshipValidation:
     """Test custom relationship name validation logic."""
@@ -257,8 +295,7 @@ class TestPlantUMLValidation:
 
         # Create mock process that times out
         mock_process = Mock()
-        mock_process.wait.side_effect = subprocess.TimeoutExpired('plantuml', 30)
-        mock_process.communicate.return_value = ("", "")
+        mock_process.communicate.side_effect = subprocess.TimeoutExpired('plantuml', 30)
         mock_popen.return_value = mock_process
 
         renders_ok, error_msg = validate_plantuml_renders("@startuml\ntest\n@enduml")
@@ -289,6 +326,189 @@ class TestPlantUMLValidation:
         assert not renders_ok
         assert len(error_msg) > 0
 
+    @patch('subprocess.Popen')
+    def test_validate_plantuml_renders_rejects_missing_markers(self, mock_popen):
+        """Test that malformed PlantUML is rejected without starting Java."""
+        from archi_mcp.server import validate_plantuml_renders
+
+        renders_ok, error_msg = validate_plantuml_renders("@startuml\nactor A\n")
+        assert not renders_ok
+        assert "@enduml" in error_msg
+
+        renders_ok, error_msg = validate_plantuml_renders("   ")
+        assert not renders_ok
+        assert "empty" in error_msg
+        mock_popen.assert_not_called()
+
+    @patch('subprocess.Popen')
+    @patch('archi_mcp.server.plantuml_validator.find_plantuml_jar', return_value="plantuml.jar")
+    @patch('archi_mcp.server.plantuml_validator.setup_java_environment', return_value='/opt/jdk/bin/java')
+    def test_validate_plantuml_renders_uses_warm_pipe(self, _mock_setup, _mock_find_jar, mock_popen, monkeypatch):
+        """Test that validation renders through the PNG pipe when pipes are enabled."""
+        from archi_mcp.server import plantuml_validator
+
+        monkeypatch.setenv("ARCHI_MCP_PLANTUML_PIPE", "true")
+        pipe = Mock()
+        pipe.render.return_value = b"\x89PNG"
+
+        with patch.object(plantuml_validator, 'get_plantuml_pipe', return_value=pipe) as get_pipe:
+            renders_ok, _ = plantuml_validator.validate_plantuml_renders("@startuml\nA\n@enduml")
+
+        assert renders_ok
+        get_pipe.assert_called_once_with('/opt/jdk/bin/java', "plantuml.jar", 'png')
+        mock_popen.assert_not_called()
+
+    @patch('subprocess.Popen')
+    @patch('archi_mcp.server.plantuml_validator.find_plantuml_jar', return_value="plantuml.jar")
+    @patch('archi_mcp.server.plantuml_validator.setup_java_environment', return_value='java')
+    def test_validate_plantuml_renders_pipe_failure_falls_back(self, _mock_setup, _mock_find_jar, mock_popen, monkeypatch):
+        """Test that a failing pipe falls back to a one-shot PlantUML process."""
+        from archi_mcp.server import plantuml_validator
+
+        monkeypatch.setenv("ARCHI_MCP_PLANTUML_PIPE", "true")
+        pipe = Mock()
+        pipe.render.side_effect = RuntimeError("pipe closed")
+        mock_popen.return_value = Mock(communicate=Mock(return_value=("", "boom")))
+
+        with patch.object(plantuml_validator, 'get_plantuml_pipe', return_value=pipe):
+            renders_ok, error_msg = plantuml_validator.validate_plantuml_renders("@startuml\nA\n@enduml")
+
+        assert not renders_ok
+        assert "boom" in error_msg
+        mock_popen.assert_called_once()
+
+    @patch('subprocess.Popen')
+    @patch('archi_mcp.server.plantuml_validator.find_plantuml_jar', return_value="plantuml.jar")
+    @patch('archi_mcp.server.plantuml_validator.setup_java_environment', return_value='java')
+    def test_validate_plantuml_renders_pipe_reports_error(self, _mock_setup, _mock_find_jar, mock_popen, monkeypatch):
+        """Test that a PlantUML error reported through the pipe fails validation."""
+        from archi_mcp.server import plantuml_validator
+        from archi_mcp.server.plantuml_pipe import PlantUMLPipeError
+
+        monkeypatch.setenv("ARCHI_MCP_PLANTUML_PIPE", "true")
+        pipe = Mock()
+        pipe.render.side_effect = PlantUMLPipeError("Error line 2: Syntax Error?", 2)
+
+        with patch.object(plantuml_validator, 'get_plantuml_pipe', return_value=pipe):
+            renders_ok, error_msg = plantuml_validator.validate_plantuml_renders("@startuml\nA -\n@enduml")
+
+        assert not renders_ok
+        assert "Error line 2" in error_msg
+        mock_popen.assert_not_called()
+
+    @patch('subprocess.run')
+    def test_java_probe_is_cached(self, mock_run, tmp_path):
+        """Test that `java -version` runs once per executable."""
+        from archi_mcp.server.plantuml_validator import _java_runs
+
+        java_path = tmp_path / "java"
+        java_path.write_text("")
+        mock_run.return_value = Mock(returncode=0)
+
+        assert _java_runs(str(java_path))
+        assert _java_runs(str(java_path))
+        assert mock_run.call_count == 1
+        assert not _java_runs(str(tmp_path / "missing-java"))
+
+    def test_find_plantuml_jar_cached(self, tmp_path, monkeypatch):
+        """Test that a located JAR is reused until it disappears."""
+        from archi_mcp.server import plantuml_validator
+
+        jar = tmp_path / "plantuml.jar"
+        jar.write_bytes(b"jar")
+        monkeypatch.setenv("PLANTUML_JAR", str(jar))
+        plantuml_validator.clear_plantuml_jar_cache()
+
+        with patch.object(plantuml_validator, '_download_plantuml_jar', return_value=None), \
+                patch.object(plantuml_validator, '_search_plantuml_jar', wraps=plantuml_validator._search_plantuml_jar) as search:
+            assert plantuml_validator.find_plantuml_jar() == str(jar)
+            debug_log = []
+            assert plantuml_validator.find_plantuml_jar(debug_log) == str(jar)
+            assert search.call_count == 1
+            assert debug_log == [f"Found PlantUML JAR: {jar}"]
+
+            jar.unlink()
+            plantuml_validator.find_plantuml_jar()
+            assert search.call_count == 2
+
+        plantuml_validator.clear_plantuml_jar_cache()
+
+    def test_setup_java_environment_skipped_when_unchanged(self, tmp_path, monkeypatch):
+        """Test that the Java lookup reruns only after JAVA_HOME or PATH change."""
+        from archi_mcp.server import plantuml_validator
+
+        java_path = str(tmp_path / "jdk" / "bin" / "java")
+        monkeypatch.delenv("JAVA_HOME", raising=False)
+        monkeypatch.setenv("PATH", "/usr/bin")
+        monkeypatch.setattr(plantuml_validator, '_java_environment', None)
+
+        with patch.object(plantuml_validator, '_find_java_executable', return_value=java_path) as find_java:
+            assert plantuml_validator.setup_java_environment() == java_path
+            assert plantuml_validator.setup_java_environment() == java_path
+            assert find_java.call_count == 1
+            assert os.environ["JAVA_HOME"] == str(tmp_path / "jdk")
+            assert os.environ["PATH"].startswith(str(tmp_path / "jdk" / "bin"))
+
+            monkeypatch.setenv("PATH", "/bin")
+            plantuml_validator.setup_java_environment()
+            assert find_java.call_count == 2
+
+    def test_validate_png_file(self, tmp_path):
+        """Test PNG file validation of size and header."""
+        from archi_mcp.server.plantuml_validator import validate_png_file, PNG_SIGNATURE, PNG_IHDR_PREFIX
+
+        valid, _ = validate_png_file(tmp_path / "missing.png")
+        assert not valid
+
+        png_file = tmp_path / "diagram.png"
+        png_file.write_bytes(PNG_SIGNATURE + PNG_IHDR_PREFIX + b"\x00" * 200)
+        valid, message = validate_png_file(png_file)
+        assert valid, message
+
+        png_file.write_bytes(b"<svg>" + b"\x00" * 200)
+        valid, message = validate_png_file(png_file)
+        assert not valid
+        assert "signature" in message
+
+    def test_validate_svg_file(self, tmp_path):
+        """Test SVG file validation of the root element prefix."""
+        from archi_mcp.server.plantuml_validator import validate_svg_file
+
+        valid, _ = validate_svg_file(tmp_path / "missing.svg")
+        assert not valid
+
+        svg_file = tmp_path / "diagram.svg"
+        svg_file.write_text('<?xml version="1.0" encoding="us-ascii" standalone="no"?><svg xmlns="http://www.w3.org/2000/svg"></svg>')
+        valid, message = validate_svg_file(svg_file)
+        assert valid, message
+
+        svg_file.write_text("Error line 3 in file")
+        valid, _ = validate_svg_file(svg_file)
+        assert not valid
+
+
+class TestPlantUMLWarmup:
+    """Test the background PlantUML warm-up started with the server."""
+
+    def test_java_and_jar_lookup_run_in_warmup_thread(self, monkeypatch):
+        """Test that startup only starts the thread; the lookups run in its target."""
+        from archi_mcp.server import main
+
+        monkeypatch.setenv("ARCHI_MCP_PLANTUML_PIPE", "true")
+        with patch.object(main, 'setup_java_environment', return_value='/opt/jdk/bin/java') as setup_java, \
+                patch.object(main, 'find_plantuml_jar', return_value='plantuml.jar') as find_jar, \
+                patch.object(main, 'warm_up_plantuml_pipes') as warm_up, \
+                patch.object(main.threading, 'Thread') as thread_cls:
+            main._start_plantuml_warmup()
+
+            thread_cls.return_value.start.assert_called_once()
+            setup_java.assert_not_called()
+            find_jar.assert_not_called()
+
+            thread_cls.call_args.kwargs['target']()
+
+        warm_up.assert_called_once_with('/opt/jdk/bin/java', 'plantuml.jar')
+
 
 class TestNormalizationFunctions:
     """Test normalization function edge cases."""
@@ -336,6 +556,17 @@ class TestNormalizationFunctions:
         assert isinstance(result1, str)
         assert isinstance(result2, str)
 
+    def test_normalization_is_case_insensitive(self):
+        """Test that normalization ignores the case of known names."""
+        from archi_mcp.server import normalize_element_type, normalize_layer, normalize_relationship_type
+
+        assert normalize_element_type("actor") == "Business_Actor"
+        assert normalize_layer("BUSINESS") == "Business"
+        assert normalize_layer(" technology ") == "Technology"
+        assert normalize_relationship_type("ACCESS") == "Access"
+        assert normalize_relationship_type("Serving") == "Serving"
+        assert normalize_relationship_type("Unknown") == "Unknown"
+
 
 class TestConfigurationHandling:
     """Test configuration parameter handling."""
@@ -368,6 +599,41 @@ class TestConfigurationHandling:
         result = get_layout_setting("ARCHI_MCP_DEFAULT_DIRECTION", "vertical")
         assert isinstance(result, str)
 
+    def test_env_settings_cached_until_cleared(self, monkeypatch):
+        """Test that settings are read once until the cache is cleared."""
+        from archi_mcp.server.config import clear_config_cache, get_env_setting
+
+        monkeypatch.setenv("ARCHI_MCP_DEFAULT_SPACING", "loose")
+        assert get_env_setting("ARCHI_MCP_DEFAULT_SPACING") == "loose"
+
+        monkeypatch.setenv("ARCHI_MCP_DEFAULT_SPACING", "normal")
+        assert get_env_setting("ARCHI_MCP_DEFAULT_SPACING") == "loose"
+
+        clear_config_cache()
+        assert get_env_setting("ARCHI_MCP_DEFAULT_SPACING") == "normal"
+
+    def test_layout_setting_respects_locked_config(self, monkeypatch):
+        """Test that client values only override settings not locked by the environment."""
+        from archi_mcp.server.config import get_layout_setting
+
+        monkeypatch.delenv("ARCHI_MCP_DEFAULT_DIRECTION", raising=False)
+        monkeypatch.setenv("ARCHI_MCP_DEFAULT_SPACING", "loose")
+
+        assert get_layout_setting("ARCHI_MCP_DEFAULT_DIRECTION") == "vertical"
+        assert get_layout_setting("ARCHI_MCP_DEFAULT_DIRECTION", "horizontal") == "horizontal"
+        assert get_layout_setting("ARCHI_MCP_DEFAULT_SPACING", "compact") == "loose"
+
+    def test_plantuml_pipe_disabled_by_default(self, monkeypatch):
+        """Test that the pipe renderer is opt-in."""
+        from archi_mcp.server.config import clear_config_cache, is_plantuml_pipe_enabled
+
+        monkeypatch.delenv("ARCHI_MCP_PLANTUML_PIPE", raising=False)
+        assert not is_plantuml_pipe_enabled()
+
+        monkeypatch.setenv("ARCHI_MCP_PLANTUML_PIPE", "true")
+        clear_config_cache()
+        assert is_plantuml_pipe_enabled()
+
 
 class TestAspectDetection:
     """Test aspect detection logic edge cases."""
@@ -409,4 +675,46 @@ class TestAspectDetection:
             result = create_func.fn(diagram=diagram)
             assert isinstance(result, str)
             # Should contain error message for unknown element type
-            assert ("Unknown_Element_Type" in result or "Invalid element type" in result)
\ No newline at end of file
+            assert ("Unknown_Element_Type" in result or "Invalid element type" in result)
+
+
+class TestErrorHandling:
+    """Test enhanced error response helpers."""
+
+    def test_extract_plantuml_error_details_skips_message_entries(self):
+        """Test that plain string log entries are ignored, even when they mention details."""
+        from archi_mcp.server.error_handler import _extract_plantuml_error_details
+
+        debug_log = [
+            "Validation details: none",
+            {"details": {"png_return_code": 1, "output": "Error line 3 in file"}},
+        ]
+
+        assert _extract_plantuml_error_details(debug_log) == (1, "Error line 3 in file", None, 3)
+
+    def test_extract_error_output_line_numbers(self):
+        """Test error line extraction from PlantUML output."""
+        from archi_mcp.server.error_handler import _extract_error_output
+
+        assert _extract_error_output({"output": "Warning\nError line 12 in file"}, None, None) == (
+            "Warning\nError line 12 in file", 12)
+        assert _extract_error_output({"output": "Error line ?; Error line 5"}, None, None)[1] == 5
+        assert _extract_error_output({"output": "Some diagram description contains errors"}, None, 7)[1] == 7
+        assert _extract_error_output({"output": "all good"}, "previous", 7) == ("previous", 7)
+
+    def test_log_file_contents_keep_tail(self, tmp_path):
+        """Test that long generation logs are cut down to their tail."""
+        from archi_mcp.server.error_handler import _add_log_file_contents, _LOG_TAIL_BYTES
+
+        log_file = tmp_path / "generation.log"
+        log_file.write_text("short log", encoding='utf-8')
+        error_parts = []
+        _add_log_file_contents(error_parts, str(log_file))
+        assert error_parts[2] == "short log"
+
+        log_file.write_text("é" * _LOG_TAIL_BYTES + "final error", encoding='utf-8')
+        error_parts = []
+        _add_log_file_contents(error_parts, str(log_file))
+        assert error_parts[2].startswith("...(truncated)\n")
+        assert error_parts[2].endswith("final error")
+        assert len(error_parts[2].encode('utf-8')) <= _LOG_TAIL_BYTES + len("...(truncated)\n")